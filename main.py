@@ -1,6 +1,5 @@
 import sys
-import argparse
-from src.dependency_graph import DbtGraph
+from src.cli.args import parse_args
 
 def main():
     """
@@ -13,189 +12,12 @@ def main():
     --dbt-project-dir: Specifies the path to the dbt project directory. If not provided, it defaults to the current directory.
     --target / -t: Specifies the dbt target to use for the test run. If not provided, it defaults to "default".
     """
-    parser = argparse.ArgumentParser(
-        prog="DBT CI Tool",
-        description="DBT CI Tool",
-        epilog="For more information, visit https://datablock.dev",
-    )
-
-    parser.add_argument(
-        "--version",
-        action="version",
-        version="%(prog)s 0.1.0",
-    )
-
-    parser.add_argument(
-        "--prod-manifest-dir",
-        "--reference-manifest-dir",
-        "--state",
-        type=str,
-        help="Path to the production/reference manifest.json directory (Not the file itself)",
-        required=True,
-    )
-
-    parser.add_argument(
-        "--profiles-dir",
-        type=str,
-        help="Path to the directory containing the dbt profiles.yml file (defaults: <dbt-directory>/profiles.yml then ~/.dbt/)",
-        required=False,
-    )
-
-    parser.add_argument(
-        '--dbt-project-dir',
-        type=str,
-        help='Path to the dbt project directory (default: current directory)',
-        default='.',
-        required=True,
-    )
-
-    parser.add_argument(
-        "--target",
-        "-t",
-        type=str,
-        help="The dbt target to use for the test run (defaults to what is defined in target in profiles.yml)",
-        required=False,
-    )
-
-    parser.add_argument(
-        "--vars",
-        "-v",
-        type=str,
-        help="A YAML string or a path to a YAML file containing variables to pass to dbt (default: empty)",
-        default="",
-        required=False,
-    )
-
-    parser.add_argument(
-        "--dry-run",
-        action="store_true",
-        help="If set, the tool will only print the dbt commands that would be executed without actually running them (default: false)",
-        default=False,
-        required=False,
-    )
-
-    parser.add_argument(
-        "--log-level",
-        type=str,
-        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
-        help="Set the logging level (default: INFO)",
-        default="INFO",
-        required=False,
-    )
-
-    parser.add_argument(
-        "--log-file",
-        type=str,
-        help="Path to a file where logs should be written (default: None, logs will be printed to stdout)",
-        default=None,
-        required=False,
-    )
-
-    parser.add_argument(
-        "--mode",
-        type=str,
-        choices=["run", "test", "snapshot", "seed", None],
-        help="The mode to run the tool in (default: run)",
-        default="run",
-        required=False,
-    )
-
-    parser.add_argument(
-        "--selector",
-        "-s",
-        type=str,
-        help="Space-separated list of selectors to run (default: empty)",
-        default="",
-        required=False,
-        nargs="*"
-    )
-
-    parser.add_argument(
-        "--runner",
-        "-r",
-        type=str,
-        choices=["local", "docker", "bash", "dbt"],
-        default="dbt",
-        help="The runner to use for running dbt commands (default: dbt)"
-    )
-
-    parser.add_argument(
-        "--entrypoint",
-        help="The command to use as the entrypoint for dbt commands (default: dbt). This can be used to specify a custom path to the dbt executable or an alternative command that wraps dbt.",
-        type=str,
-        default="dbt"
-    )
-
-    parser.add_argument(
-        "--shell-path",
-        "--bash-path",
-        type=str,
-        help="Path to the shell executable to use when runner is set to 'bash' (default: /bin/bash)",
-        default="/bin/bash",
-        required=False,
-    )
-
-    parser.add_argument(
-        "--docker-image",
-        type=str,
-        help="Docker image to use (default: ghcr.io/dbt-labs/dbt-core:latest)",
-        default="ghcr.io/dbt-labs/dbt-core:latest",
-        required=False,
-    )
-
-    parser.add_argument(
-        "--docker-platform",
-        type=str,
-        help="Platform for Docker image (e.g., linux/amd64, linux/arm64). Use linux/amd64 on Apple Silicon for compatibility",
-        default=None,
-        required=False,
-    )
-
-    parser.add_argument(
-        "--docker-volumes",
-        type=str,
-        nargs="*",
-        help="Additional volume mounts in format 'host:container' or 'host:container:ro'",
-        default=[],
-        required=False,
-    )
-
-    parser.add_argument(
-        "--docker-env",
-        type=str,
-        nargs="*",
-        help="Environment variables to pass to Docker in format 'KEY=VALUE'",
-        default=[],
-        required=False,
-    )
-
-    parser.add_argument(
-        "--docker-network",
-        type=str,
-        help="Docker network mode (default: host)",
-        default="host",
-        required=False,
-    )
-
-    parser.add_argument(
-        "--docker-user",
-        type=str,
-        help="User to run as inside container (default: current UID:GID)",
-        default=None,
-        required=False,
-    )
-
-    parser.add_argument(
-        "--docker-args",
-        type=str,
-        help="Additional docker run arguments as a single string",
-        default="",
-        required=False,
-    )
-    
-    args = parser.parse_args()
+    args = parse_args(sys.argv[1:])
 
     try:
+        # Deferred so that --help/--version never pay for importing dbt and the runners
+        from src.dependency_graph import DbtGraph
+
         # Implement the main functionality here
         #print(args)
         target_dependency_graph = DbtGraph(args)
@@ -1,14 +1,68 @@
 import os
 import json
 import sys
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Sequence, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.schema import SlackReport
+from src.utilities import json_dumps
+
+
+class _WebhookRetry(Retry):
+    """Retry that honours Retry-After on 429 only; urllib3 also retries 413 and 503 when it is present."""
+    RETRY_AFTER_STATUS_CODES = frozenset({429})
+
+
+def _build_session() -> requests.Session:
+    """Create a pooled session so repeated webhook calls reuse the same TLS connection."""
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            # Webhook posts are not idempotent: a read timeout or a 5xx may come after Slack already
+            # posted the message, so only retry failed connects and 429 (honouring Retry-After)
+            max_retries=_WebhookRetry(
+                total=3,
+                connect=3,
+                read=0,
+                other=0,
+                backoff_factor=0.2,
+                status_forcelist=[429],
+                allowed_methods=frozenset({"POST"}),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+    )
+    return session
+
+
+_SESSION = _build_session()
+
+# Slack rejects messages with more than 50 blocks
+SLACK_MAX_BLOCKS = 50
+_DIVIDER_BLOCK = {"type": "divider"}
+
+# Constant report for the common "nothing changed" case, built once at import time
+_NO_CHANGES_MSG = "✅ No modified models detected"
+_NO_CHANGES_BLOCKS = (
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": f"*dbt CI Report*\n\n{_NO_CHANGES_MSG}"
+        }
+    },
+)
 
 
 def send_slack_message(
     message: str,
     webhook_url: Optional[str] = None,
-    blocks: Optional[List[Dict[str, Any]]] = None,
+    blocks: Optional[Sequence[Dict[str, Any]]] = None,
     channel: Optional[str] = None,
     username: Optional[str] = None,
     icon_emoji: Optional[str] = None
@@ -67,9 +121,9 @@ def send_slack_message(
         payload["icon_emoji"] = icon_emoji
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             webhook_url,
-            json=payload,
+            data=json_dumps(payload, indent=False),
             headers={"Content-Type": "application/json"},
             timeout=10
         )
@@ -86,39 +140,29 @@ def send_slack_message(
         return False
 
 
-def send_dbt_ci_report(
+def build_dbt_ci_report(
     modified_nodes: List[str],
-    webhook_url: Optional[str] = None,
     project_name: Optional[str] = None,
     branch: Optional[str] = None,
     commit_sha: Optional[str] = None
-) -> bool:
+) -> SlackReport:
     """
-    Send a formatted dbt CI report to Slack.
+    Build the message and Block Kit blocks for a dbt CI report without sending it.
     
     Args:
         modified_nodes: List of modified node names
-        webhook_url: Slack webhook URL (optional, reads from env)
         project_name: Name of the dbt project
         branch: Git branch name
         commit_sha: Git commit SHA
     
     Returns:
-        bool: True if message was sent successfully
+        SlackReport: The fallback text message and its blocks
     """
     if not modified_nodes:
-        message = "✅ No modified models detected"
-        blocks = [
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*dbt CI Report*\n\n✅ No modified models detected"
-                }
-            }
-        ]
+        message = _NO_CHANGES_MSG
+        blocks = _NO_CHANGES_BLOCKS
     else:
-        node_list = "\n".join([f"• `{node}`" for node in modified_nodes[:20]])
+        node_list = "\n".join(f"• `{node}`" for node in modified_nodes[:20])
         if len(modified_nodes) > 20:
             node_list += f"\n... and {len(modified_nodes) - 20} more"
         
@@ -159,10 +203,96 @@ def send_dbt_ci_report(
                 }]
             })
     
+    return SlackReport(message=message, blocks=blocks)
+
+
+def send_dbt_ci_report(
+    modified_nodes: List[str],
+    webhook_url: Optional[str] = None,
+    project_name: Optional[str] = None,
+    branch: Optional[str] = None,
+    commit_sha: Optional[str] = None
+) -> bool:
+    """
+    Send a formatted dbt CI report to Slack.
+    
+    Args:
+        modified_nodes: List of modified node names
+        webhook_url: Slack webhook URL (optional, reads from env)
+        project_name: Name of the dbt project
+        branch: Git branch name
+        commit_sha: Git commit SHA
+    
+    Returns:
+        bool: True if message was sent successfully
+    """
+    report = build_dbt_ci_report(
+        modified_nodes=modified_nodes,
+        project_name=project_name,
+        branch=branch,
+        commit_sha=commit_sha
+    )
+
     return send_slack_message(
-        message=message,
-        blocks=blocks,
+        message=report["message"],
+        blocks=report["blocks"],
         webhook_url=webhook_url,
         username="dbt CI",
         icon_emoji=":dbt:"
     )
+
+
+def send_slack_messages_batch(
+    reports: List[SlackReport],
+    webhook_url: Optional[str] = None,
+    username: Optional[str] = "dbt CI",
+    icon_emoji: Optional[str] = ":dbt:"
+) -> bool:
+    """
+    Send several reports using as few webhook calls as possible.
+    
+    Reports are packed into a single payload, separated by divider blocks, as long as the
+    payload stays within Slack's limit of 50 blocks per message. Additional messages are only
+    sent when the reports do not fit in one. A single report with more than 50 blocks is truncated.
+    
+    Args:
+        reports: Reports to send, e.g. from build_dbt_ci_report
+        webhook_url: Slack webhook URL (optional, reads from env)
+        username: Optional bot username override
+        icon_emoji: Optional emoji icon
+    
+    Returns:
+        bool: True if every message was sent successfully
+    """
+    batches: List[Tuple[List[str], List[Dict[str, Any]]]] = []
+    messages: List[str] = []
+    blocks: List[Dict[str, Any]] = []
+
+    for report in reports:
+        report_blocks = list(report["blocks"])[:SLACK_MAX_BLOCKS]
+        # A divider is needed between this report and the previous one in the same batch
+        needed = len(report_blocks) + (1 if blocks else 0)
+
+        if blocks and len(blocks) + needed > SLACK_MAX_BLOCKS:
+            batches.append((messages, blocks))
+            messages, blocks = [], []
+
+        if blocks:
+            blocks.append(_DIVIDER_BLOCK)
+        blocks.extend(report_blocks)
+        messages.append(report["message"])
+
+    if blocks:
+        batches.append((messages, blocks))
+
+    success = True
+    for batch_messages, batch_blocks in batches:
+        success = send_slack_message(
+            message="\n".join(batch_messages),
+            blocks=batch_blocks,
+            webhook_url=webhook_url,
+            username=username,
+            icon_emoji=icon_emoji
+        ) and success
+
+    return success
@@ -0,0 +1,292 @@
+"""Argument parser construction for the DBT CI Tool command-line interface."""
+import argparse
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# (flags, add_argument keyword arguments)
+ArgumentSpec = Tuple[Tuple[str, ...], Dict[str, Any]]
+
+
+def sniff_option(argv: List[str], flags: Tuple[str, ...]) -> Optional[str]:
+    """
+    Return the value passed to any of `flags` in argv without building the full parser.
+    A throwaway parser that knows only `flags` reads argv, so every spelling argparse accepts
+    (`-rdocker`, `--runner=docker`, abbreviations such as `--run docker`) is picked up.
+    Returns None when the option is absent or its value is missing.
+    """
+    sniffer = argparse.ArgumentParser(add_help=False, exit_on_error=False)
+    sniffer.add_argument(*flags, dest="value")
+    try:
+        known, _ = sniffer.parse_known_args(argv)
+    except argparse.ArgumentError:
+        return None
+    return known.value
+
+
+# Arguments needed regardless of the selected runner.
+_BASE_ARGS: Tuple[ArgumentSpec, ...] = (
+    (
+        ("--version",),
+        {
+            "action": "version",
+            "version": "%(prog)s 0.1.0",
+        },
+    ),
+    (
+        ("--prod-manifest-dir", "--reference-manifest-dir", "--state"),
+        {
+            "type": str,
+            "help": "Path to the production/reference manifest.json directory (Not the file itself)",
+            "required": True,
+        },
+    ),
+    (
+        ("--profiles-dir",),
+        {
+            "type": str,
+            "help": "Path to the directory containing the dbt profiles.yml file (defaults: <dbt-directory>/profiles.yml then ~/.dbt/)",
+            "required": False,
+        },
+    ),
+    (
+        ("--dbt-project-dir",),
+        {
+            "type": str,
+            "help": "Path to the dbt project directory (default: current directory)",
+            "default": ".",
+            "required": True,
+        },
+    ),
+    (
+        ("--target", "-t"),
+        {
+            "type": str,
+            "help": "The dbt target to use for the test run (defaults to what is defined in target in profiles.yml)",
+            "required": False,
+        },
+    ),
+    (
+        ("--vars", "-v"),
+        {
+            "type": str,
+            "help": "A YAML string or a path to a YAML file containing variables to pass to dbt (default: empty)",
+            "default": "",
+            "required": False,
+        },
+    ),
+    (
+        ("--dry-run",),
+        {
+            "action": "store_true",
+            "help": "If set, the tool will only print the dbt commands that would be executed without actually running them (default: false)",
+            "default": False,
+            "required": False,
+        },
+    ),
+    (
+        ("--include-compiled-code",),
+        {
+            "action": "store_true",
+            "help": "If set, keep each node's compiled SQL in the dependency graph and its JSON output (default: false)",
+            "default": False,
+            "required": False,
+        },
+    ),
+    (
+        ("--no-graph-cache",),
+        {
+            "action": "store_true",
+            "help": "If set, always build the dependency graph from the manifest instead of reusing the cached copy in DBT_CI_CACHE_DIR (default: false)",
+            "default": False,
+            "required": False,
+        },
+    ),
+    (
+        ("--log-level",),
+        {
+            "type": str,
+            "choices": ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+            "help": "Set the logging level (default: INFO)",
+            "default": "INFO",
+            "required": False,
+        },
+    ),
+    (
+        ("--log-file",),
+        {
+            "type": str,
+            "help": "Path to a file where logs should be written (default: None, logs will be printed to stdout)",
+            "default": None,
+            "required": False,
+        },
+    ),
+    (
+        ("--mode",),
+        {
+            "type": str,
+            "choices": ["run", "test", "snapshot", "seed", None],
+            "help": "The mode to run the tool in (default: run)",
+            "default": "run",
+            "required": False,
+        },
+    ),
+    (
+        ("--selector", "-s"),
+        {
+            "type": str,
+            "help": "Space-separated list of selectors to run (default: empty)",
+            "default": "",
+            "required": False,
+            "nargs": "*",
+        },
+    ),
+    (
+        ("--runner", "-r"),
+        {
+            "type": str,
+            "choices": ["local", "docker", "bash", "dbt"],
+            "default": "dbt",
+            "help": "The runner to use for running dbt commands (default: dbt)",
+        },
+    ),
+    (
+        ("--entrypoint",),
+        {
+            "help": "The command to use as the entrypoint for dbt commands (default: dbt). This can be used to specify a custom path to the dbt executable or an alternative command that wraps dbt.",
+            "type": str,
+            "default": "dbt",
+        },
+    ),
+)
+
+# Arguments only used by the bash runner.
+_BASH_ARGS: Tuple[ArgumentSpec, ...] = (
+    (
+        ("--shell-path", "--bash-path"),
+        {
+            "type": str,
+            "help": "Path to the shell executable to use when runner is set to 'bash' (default: /bin/bash)",
+            "default": "/bin/bash",
+            "required": False,
+        },
+    ),
+)
+
+# Arguments only used by the docker runner.
+_DOCKER_ARGS: Tuple[ArgumentSpec, ...] = (
+    (
+        ("--docker-image",),
+        {
+            "type": str,
+            "help": "Docker image to use (default: ghcr.io/dbt-labs/dbt-core:latest)",
+            "default": "ghcr.io/dbt-labs/dbt-core:latest",
+            "required": False,
+        },
+    ),
+    (
+        ("--docker-platform",),
+        {
+            "type": str,
+            "help": "Platform for Docker image (e.g., linux/amd64, linux/arm64). Use linux/amd64 on Apple Silicon for compatibility",
+            "default": None,
+            "required": False,
+        },
+    ),
+    (
+        ("--docker-volumes",),
+        {
+            "type": str,
+            "nargs": "*",
+            "help": "Additional volume mounts in format 'host:container' or 'host:container:ro'",
+            "default": [],
+            "required": False,
+        },
+    ),
+    (
+        ("--docker-env",),
+        {
+            "type": str,
+            "nargs": "*",
+            "help": "Environment variables to pass to Docker in format 'KEY=VALUE'",
+            "default": [],
+            "required": False,
+        },
+    ),
+    (
+        ("--docker-network",),
+        {
+            "type": str,
+            "help": "Docker network mode (default: host)",
+            "default": "host",
+            "required": False,
+        },
+    ),
+    (
+        ("--docker-user",),
+        {
+            "type": str,
+            "help": "User to run as inside container (default: current UID:GID)",
+            "default": None,
+            "required": False,
+        },
+    ),
+    (
+        ("--docker-args",),
+        {
+            "type": str,
+            "help": "Additional docker run arguments as a single string",
+            "default": "",
+            "required": False,
+        },
+    ),
+)
+
+
+def _add_arguments(parser: argparse.ArgumentParser, specs: Tuple[ArgumentSpec, ...], with_help: bool) -> None:
+    """Register each (flags, kwargs) spec on the parser, leaving out help text unless it will be shown."""
+    for flags, kwargs in specs:
+        if not with_help:
+            kwargs = {key: value for key, value in kwargs.items() if key != "help"}
+        parser.add_argument(*flags, **kwargs)
+
+
+@lru_cache(maxsize=8)
+def build_parser(runner: str, include_all: bool = False) -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the given runner.
+    Runner-specific argument groups are only added when that runner is selected, or when
+    include_all is set (used for --help so every option is still documented). Help strings
+    are only attached when include_all is set, since they are never shown otherwise.
+    The parser definition is static, so it is cached per (runner, include_all) for callers that
+    parse arguments repeatedly in one process.
+    """
+    parser = argparse.ArgumentParser(
+        prog="DBT CI Tool",
+        description="DBT CI Tool",
+        epilog="For more information, visit https://datablock.dev",
+    )
+
+    _add_arguments(parser, _BASE_ARGS, with_help=include_all)
+
+    if include_all or runner == "bash":
+        _add_arguments(parser, _BASH_ARGS, with_help=include_all)
+
+    if include_all or runner == "docker":
+        _add_arguments(parser, _DOCKER_ARGS, with_help=include_all)
+
+    return parser
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse the command line with the option groups of the runner it selects.
+    Options from another runner's group (e.g. --docker-image with --runner dbt) are accepted and
+    ignored; anything else is reported by a parser with every group added.
+    """
+    include_all = any(arg in ("-h", "--help") for arg in argv)
+    runner = sniff_option(argv, ("--runner", "-r")) or "dbt"
+
+    args, unknown = build_parser(runner, include_all=include_all).parse_known_args(argv)
+    if unknown:
+        args = build_parser(runner, include_all=True).parse_args(argv)
+    return args
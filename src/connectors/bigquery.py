@@ -1,15 +1,27 @@
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Optional
 from google.cloud import bigquery
 from src.paths import get_profiles_file
 
 def bigquery_client(args) -> bigquery.Client:
-    dbt_profile = get_profiles_file(
+    return _bigquery_client(
         dbt_project_dir=args.dbt_project_dir,
-        profiles_dir=args.profiles_dir
+        profiles_dir=args.profiles_dir,
+        target=args.target
+    )
+
+@lru_cache(maxsize=8)
+def _bigquery_client(dbt_project_dir: str, profiles_dir: Optional[str], target: str) -> bigquery.Client:
+    # Cached per (project, profiles, target) so auth and transport setup only happen once per run
+    dbt_profile = get_profiles_file(
+        dbt_project_dir=dbt_project_dir,
+        profiles_dir=profiles_dir
     )
 
-    output = dbt_profile.get("outputs", {}).get(args.target, {})
+    output = dbt_profile.get("outputs", {}).get(target, {})
     if not output:
-        raise ValueError(f"No output configuration found for target '{args.target}' in profiles.yml")
+        raise ValueError(f"No output configuration found for target '{target}' in profiles.yml")
 
     client = bigquery.Client(
         project=output.get("project", ""),
@@ -18,7 +30,36 @@ def bigquery_client(args) -> bigquery.Client:
 
     return client
 
-def bigquery_query(client: bigquery.Client, query: str):
-    query_job = client.query(query)
-    results = query_job.result()
-    return results.to_dataframe()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def _bqstorage_available() -> bool:
+    """Check once whether google-cloud-bigquery-storage is installed."""
+    return find_spec("google.cloud.bigquery_storage") is not None
+
+def bigquery_query(
+    client: bigquery.Client,
+    query: str,
+    job_config: Optional[bigquery.QueryJobConfig] = None,
+    timeout: Optional[float] = None
+):
+    """
+    Run a query and return the results as a pandas DataFrame.
+    Results are downloaded through the BigQuery Storage API when it is installed, and paginated
+    over REST otherwise.
+    """
+    query_job = client.query(query, job_config=job_config)
+    results = query_job.result(timeout=timeout)
+    return results.to_dataframe(create_bqstorage_client=_bqstorage_available())
+
+def bigquery_query_arrow(
+    client: bigquery.Client,
+    query: str,
+    job_config: Optional[bigquery.QueryJobConfig] = None,
+    timeout: Optional[float] = None
+):
+    """
+    Run a query and return the results as a pyarrow Table, skipping the conversion to pandas.
+    Like bigquery_query, it streams Arrow batches through the BigQuery Storage API when it is installed.
+    """
+    query_job = client.query(query, job_config=job_config)
+    results = query_job.result(timeout=timeout)
+    return results.to_arrow(create_bqstorage_client=_bqstorage_available())
@@ -1,11 +1,11 @@
-import json
 import os
 from src.runners import run_dbt_command
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from argparse import Namespace
-from src.parser import generate_dependency_graph
+from src.parser import build_downstream_adjacency, downstream_closure, generate_cached_dependency_graph, node_content_hash
 from src.paths import get_dbt_project_file, get_manifest_file, get_prod_manifest_file, get_profiles_file
 from src.schema import DependencyGraph, DependencyGraphNode, DependencyGraphNodeType, RunnerConfig
+from src.utilities import json_dumps, run_multithreaded, set_default
 
 class DbtGraph:
     """
@@ -30,9 +30,11 @@ class DbtGraph:
         self.selector = args.selector
         self.mode = args.mode
         self.user_production_state = user_production_state
+        self.include_compiled_code: bool = getattr(args, 'include_compiled_code', False)
+        self.use_graph_cache: bool = not getattr(args, 'no_graph_cache', False)
         
         # Docker configuration
-        self.docker_image = args.docker_image
+        self.docker_image = getattr(args, 'docker_image', 'ghcr.io/dbt-labs/dbt-core:latest')
         self.docker_platform = getattr(args, 'docker_platform', None)
         self.docker_volumes = getattr(args, 'docker_volumes', [])
         self.docker_env = getattr(args, 'docker_env', [])
@@ -41,9 +43,8 @@ class DbtGraph:
         self.docker_args = getattr(args, 'docker_args', '')
         
         # Bash runner configuration
-        shell_path = getattr(args, 'shell_path', '/bin/bash')
-        # Shell path needs to be absolute for subprocess execution
-        self.shell_path = os.path.abspath(shell_path) if not os.path.isabs(shell_path) else shell_path
+        # Kept as provided; only made absolute when a runner config is built (see _get_runner_config)
+        self.shell_path: str = getattr(args, 'shell_path', '/bin/bash')
         
         # Keep paths as provided by user (relative or absolute)
         self.dbt_project_dir: str = args.dbt_project_dir
@@ -54,17 +55,48 @@ class DbtGraph:
             dbt_project_dir=args.dbt_project_dir,
             profiles_dir=args.profiles_dir
         )
-        self.reference_manifest_file = get_prod_manifest_file(args.prod_manifest_dir)
+        # Both manifests can be large; read and decode them concurrently, alongside building
+        # (or loading the cached) dependency graph so its file I/O overlaps the manifest reads
+        results = run_multithreaded(
+            [
+                lambda: get_prod_manifest_file(args.prod_manifest_dir),
+                lambda: get_manifest_file(args.dbt_project_dir),
+                lambda: generate_cached_dependency_graph(
+                    args.dbt_project_dir if not self.user_production_state else args.prod_manifest_dir,
+                    is_state_manifest=self.user_production_state,
+                    include_compiled_code=self.include_compiled_code,
+                    use_cache=self.use_graph_cache
+                ),
+            ],
+            threads=3
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        self.reference_manifest_file, self.target_manifest_file, self.dependency_graph = results
         self.prod_manifest_file = self.reference_manifest_file
-        self.target_manifest_file = get_manifest_file(args.dbt_project_dir)
         self.target = self.set_target()
         self.vars: str = args.vars
         self.dry_run: bool = args.dry_run
         self.log_level: str = args.log_level
-        self.dependency_graph = generate_dependency_graph(
-            args.dbt_project_dir if not self.user_production_state else args.prod_manifest_dir,
-            is_state_manifest=self.user_production_state
+        # Node type buckets, i.e. every top-level key of the graph except "metadata"
+        self._searchable_types: Tuple[DependencyGraphNodeType, ...] = tuple(
+            node_type for node_type in self.dependency_graph if node_type != "metadata"
+        )
+        self._searchable_buckets: Tuple[Dict[str, DependencyGraphNode], ...] = tuple(
+            self.dependency_graph[node_type] for node_type in self._searchable_types
         )
+        # Flat lookup of node name -> (node_type, node); the first node type wins on name clashes
+        self._node_index: Dict[str, Tuple[DependencyGraphNodeType, DependencyGraphNode]] = {}
+        for node_type, nodes in zip(self._searchable_types, self._searchable_buckets):
+            for node_id, node in nodes.items():
+                self._node_index.setdefault(node_id, (node_type, node))
+        # Unique id -> node, used to walk downstream edges when diffing manifests
+        # Built from the buckets rather than _node_index, which keeps only one node per name
+        self._id_index: Dict[str, DependencyGraphNode] = {
+            node["id"]: node for nodes in self._searchable_buckets for node in nodes.values()
+        }
+        self._downstream_adjacency = build_downstream_adjacency(self.dependency_graph)
 
     def set_target(self):
         """Set the target from args if provided, otherwise get from profile."""
@@ -133,7 +165,8 @@ class DbtGraph:
             docker_network=self.docker_network,
             docker_user=self.docker_user,
             docker_args=self.docker_args,
-            shell_path=self.shell_path
+            # Shell path needs to be absolute for subprocess execution; only the bash runner uses it
+            shell_path=self._get_absolute_path(self.shell_path) if self.runner == "bash" else self.shell_path
         )
 
     def get_state_modified(
@@ -176,43 +209,135 @@ class DbtGraph:
             return None
         
         # Parse output to extract node names
-        project_profile = self.project.get("profile", "")
+        # Build the prefix once rather than formatting it for every output line
+        prefix = f"{self.project.get('profile', '')}."
+        prefix_len = len(prefix)
         modified_nodes = {
             line.strip() for line in output.stdout.splitlines()
-            if line.startswith(f"{project_profile}.")
+            if line[:prefix_len] == prefix
         }
         
-        node_names = [nid.split(".")[-1] for nid in modified_nodes]
+        node_names = [nid.rpartition(".")[2] for nid in modified_nodes]
         return node_names if node_names else None
 
             
 
-    def get_node(self, node_id: str) -> Dict[str, DependencyGraphNode] | None:
-        match = None
-        for node_type in self.dependency_graph.keys():
-            if node_type == "metadata":
+    def get_modified_nodes(self) -> List[str] | None:
+        """Get modified nodes and their descendants by diffing the reference and target manifests.
+
+        Works like "state:modified+" without invoking dbt. A node counts as modified when its
+        content hash differs from the reference manifest (or it is new), or when it uses a macro
+        whose body changed, directly or through the macros it calls. Hashes are only computed here,
+        so building the graph does not pay for them. Only the downstream closure of the modified
+        nodes is walked.
+
+        When the graph was built from the reference manifest (user_production_state), the graph
+        nodes are compared against the target manifest instead; nodes that only exist in the
+        target are not part of that graph and cannot be reported.
+
+        Returns:
+            Sorted list of modified node names, or None if no changes
+        """
+        # The manifest the graph was built from, and the one its nodes are compared to
+        if self.user_production_state:
+            graph_manifest, other_manifest = self.reference_manifest_file, self.target_manifest_file
+        else:
+            graph_manifest, other_manifest = self.target_manifest_file, self.reference_manifest_file
+        graph_items = {
+            **graph_manifest.get("nodes", {}),
+            **graph_manifest.get("sources", {}),
+            **graph_manifest.get("exposures", {}),
+        }
+        other_items = {
+            **other_manifest.get("nodes", {}),
+            **other_manifest.get("sources", {}),
+            **other_manifest.get("exposures", {}),
+        }
+
+        target_macros = self.target_manifest_file.get("macros", {})
+        reference_macros = self.reference_manifest_file.get("macros", {})
+        changed_macros = {
+            macro_id
+            for macro_id, macro in target_macros.items()
+            if macro_id not in reference_macros
+            or node_content_hash(macro) != node_content_hash(reference_macros[macro_id])
+        }
+        if changed_macros:
+            # A macro calling a changed macro renders differently too; follow callee -> caller edges
+            callers: Dict[str, List[str]] = {}
+            for macro_id, macro in target_macros.items():
+                for callee in macro.get("depends_on", {}).get("macros", ()):
+                    callers.setdefault(callee, []).append(macro_id)
+            pending = list(changed_macros)
+            while pending:
+                for caller in callers.get(pending.pop(), ()):
+                    if caller not in changed_macros:
+                        changed_macros.add(caller)
+                        pending.append(caller)
+
+        modified: Set[str] = set()
+        for node_id, node in self._id_index.items():
+            graph_item = graph_items.get(node_id)
+            if graph_item is None:
                 continue
+            other_item = other_items.get(node_id)
+            if other_item is None:
+                # New in the target; a node missing from the target was deleted, not modified
+                if not self.user_production_state:
+                    modified.add(node_id)
+            elif node_content_hash(graph_item) != node_content_hash(other_item):
+                modified.add(node_id)
+            elif changed_macros and not changed_macros.isdisjoint(graph_item.get("depends_on", {}).get("macros", ())):
+                modified.add(node_id)
 
-            if node_id in self.dependency_graph[node_type]:
-                match = self.dependency_graph[node_type][node_id]
-                break
-        
-        return match
+        # Walk the downstream edges of the modified nodes only
+        affected = downstream_closure(self._downstream_adjacency, modified)
+
+        node_names = sorted({self._id_index[node_id]["name"] for node_id in affected if node_id in self._id_index})
+        return node_names if node_names else None
+
+    def get_node(self, node_id: str) -> Dict[str, DependencyGraphNode] | None:
+        match = self._node_index.get(node_id)
+        if match is not None:
+            return match[1]
+
+        # Fall back to the buckets in case nodes were added to the graph after construction
+        for bucket in self._searchable_buckets:
+            node = bucket.get(node_id)
+            if node is not None:
+                return node
+        return None
             
     def get_nodes(self, node_ids: List[str]) -> Dict[str, Dict[str, DependencyGraphNode]] | None:
-        nodes = {}
-        for node_type in self.dependency_graph.keys():
-            if node_type == "metadata":
-                continue
-
-            for node_id in node_ids:
-                if node_id in self.dependency_graph[node_type]:
-                    nodes[node_id] = self.dependency_graph[node_type][node_id]
+        nodes = {
+            node_id: self._node_index[node_id][1]
+            for node_id in node_ids
+            if node_id in self._node_index
+        }
         if len(nodes.keys()) == 0:
             return None
         
         return nodes
     
+    def get_compiled_code(self, node_id: str) -> Optional[str]:
+        """Get the compiled SQL of a node by name.
+
+        Read from the manifest the graph was built from, so it is available even when the graph
+        itself was built without --include-compiled-code.
+
+        Returns:
+            The compiled SQL, or None if the node is unknown or was never compiled
+        """
+        node = self.get_node(node_id)
+        if node is None:
+            return None
+        if node.get("compiled_code") is not None:
+            return node["compiled_code"]
+
+        manifest = self.reference_manifest_file if self.user_production_state else self.target_manifest_file
+        item = manifest.get("nodes", {}).get(node["id"])
+        return item.get("compiled_code") if item else None
+
     def get_target_profile(self) -> Dict:
         """Get the default profile from the profiles.yml file."""
         profile = self.project.get("profile", "")
@@ -229,11 +354,23 @@ class DbtGraph:
         return self.dependency_graph
     
     def to_json(self, destination_path: str = "./dependency_graph.json") -> None:
-        """Convert the DependencyGraph instance to a JSON string."""
-        with open(destination_path, 'w', encoding='utf-8') as file:
-            json.dump(
-                obj=self.dependency_graph, 
-                fp=file, 
-                indent=4, 
-                default=lambda o: list(o) if isinstance(o, set) else o
-            )
\ No newline at end of file
+        """Convert the DependencyGraph instance to a JSON string.
+
+        Sets are written sorted so the output is deterministic. If the destination already holds
+        identical content it is left untouched (keeping its mtime for downstream caches); otherwise
+        it is replaced atomically.
+        """
+        content = json_dumps(self.dependency_graph, default=set_default)
+
+        try:
+            if os.path.getsize(destination_path) == len(content):
+                with open(destination_path, 'rb') as file:
+                    if file.read() == content:
+                        return
+        except OSError:
+            pass
+
+        tmp_path = f"{destination_path}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(content)
+        os.replace(tmp_path, destination_path)
\ No newline at end of file
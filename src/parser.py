@@ -1,9 +1,13 @@
 import sys
 import json
 import os
-from typing import Dict, List, Set, Any
-from src.paths import get_manifest_file, get_prod_manifest_file
-from src.schema import DBTManifest, DependencyGraph, DependencyGraphNodeType
+import hashlib
+from collections import defaultdict
+from array import array
+from typing import Dict, List, Optional, Set, Any
+from src.paths import get_manifest_file, get_prod_manifest_file, get_manifest_path, get_prod_manifest_path
+from src.utilities import json_dumps, json_loads, set_default
+from src.schema import DependencyGraph, DependencyGraphNode, DependencyGraphNodeType, DownstreamAdjacency
 
 manifest_key_mapping = {
     "model": "nodes",
@@ -15,33 +19,84 @@ manifest_key_mapping = {
     "source": "sources"
 }
 
-def skeleton_dependencies_structure():
-    return {
-        "node_dependencies": set(),
-        "dependencies_by_type": {
-            "model": set(),
-            "macro": set(),
-            "seed": set(),
-            "snapshot": set(),
-            "source": set(),
-            "test": set(),
-            "exposure": set(),
-        },
+# Manifest sections holding the items of the tracked node types, in manifest_key_mapping order
+MANIFEST_ITEM_SECTIONS = tuple(dict.fromkeys(manifest_key_mapping.values()))
+
+# Bump whenever the structure of the generated DependencyGraph changes so stale caches are ignored
+DEPENDENCY_GRAPH_CACHE_VERSION = 10
+DEPENDENCY_GRAPH_CACHE_SUFFIX = ".depgraph.json"
+
+# The dependency entries of every graph node
+DEPENDENCY_KEYS = (
+    "upstream_dependencies",
+    "downstream_dependencies",
+    "indirect_upstream_dependencies",
+    "indirect_downstream_dependencies",
+)
+
+# Top-level manifest sections read when building the dependency graph
+DEPENDENCY_GRAPH_MANIFEST_SECTIONS = (
+    "metadata",
+    "nodes",
+    "macros",
+    "sources",
+    "exposures",
+    "child_map",
+)
+
+def node_content_hash(item: Dict[str, Any]) -> str:
+    """Hash the parts of a manifest item that decide whether it changed between two manifests.
+
+    Covers the file checksum, raw SQL (or macro body), unrendered config, dependencies and column names.
+    Rendered values such as database/schema are left out so that the same node hashes identically
+    across targets.
+    """
+    payload = {
+        "checksum": (item.get("checksum") or {}).get("checksum"),
+        "code": item.get("raw_code") or item.get("macro_sql"),
+        "config": item.get("unrendered_config", {}),
+        "depends_on": item.get("depends_on", {}),
+        "columns": sorted(item.get("columns", {}).keys()),
     }
-
-def generate_dependency_graph(manifest_file_path: str, is_state_manifest: bool = False) -> DependencyGraph:
+    canonical = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+# Resource types tracked in dependencies_by_type
+DEPENDENCY_TYPES = ("model", "macro", "seed", "snapshot", "source", "test", "exposure")
+
+# Shared placeholder for empty dependency sets; never mutated
+EMPTY_DEPENDENCIES: frozenset = frozenset()
+
+def add_dependency_by_type(dependencies_by_type: Dict[str, Any], dep_type: str, name: str) -> None:
+    """Add name under dep_type, replacing the shared empty placeholder with a real set on first use."""
+    members = dependencies_by_type[dep_type]
+    if members is EMPTY_DEPENDENCIES:
+        members = dependencies_by_type[dep_type] = set()
+    members.add(name)
+
+def generate_dependency_graph(
+    manifest_file_path: str,
+    is_state_manifest: bool = False,
+    include_compiled_code: bool = False
+) -> DependencyGraph:
     """Generate dependency graph from manifest file.
     
     Args:
         manifest_file_path: Path to dbt project dir (looks in target/) or state dir (looks for manifest.json directly)
         is_state_manifest: If True, load from {path}/manifest.json; if False, load from {path}/target/manifest.json
+        include_compiled_code: If True, copy each node's compiled SQL into the graph; otherwise store None
     """
     if is_state_manifest:
-        manifest_file = get_prod_manifest_file(manifest_file_path)
+        manifest_file = get_prod_manifest_file(manifest_file_path, sections=DEPENDENCY_GRAPH_MANIFEST_SECTIONS)
     else:
-        manifest_file = get_manifest_file(manifest_file_path)
+        manifest_file = get_manifest_file(manifest_file_path, sections=DEPENDENCY_GRAPH_MANIFEST_SECTIONS)
     child_map = manifest_file.get("child_map", {})
 
+    # Single id -> manifest item lookup across every section the graph reads from
+    manifest_items: Dict[str, Dict[str, Any]] = {}
+    for section in MANIFEST_ITEM_SECTIONS:
+        manifest_items.update(manifest_file.get(section, {}))
+
     dependency_graph: DependencyGraph = {
         "metadata": manifest_file.get("metadata", {}),
         "model": {},
@@ -53,23 +108,32 @@ def generate_dependency_graph(manifest_file_path: str, is_state_manifest: bool =
         "source": {}
     }
 
+    # child -> parents, built while walking child_map; this is the manifest's parent_map, so that
+    # section does not need to be read at all
+    parent_map: Dict[str, List[str]] = defaultdict(list)
+
     for key, downstream_dependencies in child_map.items():
-        node_type: DependencyGraphNodeType = key.split(".")[0]
-        manifest_key = manifest_key_mapping.get(node_type)
-        full_item = manifest_file.get(manifest_key, {}).get(key, None) if manifest_key else None
+        # The decoder gives every occurrence of an id its own string; intern them so the
+        # dependency sets share one object per id
+        key = sys.intern(key)
+        downstream_dependencies = [sys.intern(dep_id) for dep_id in downstream_dependencies]
+        for dep_id in downstream_dependencies:
+            parent_map[dep_id].append(key)
 
+        node_type: DependencyGraphNodeType = key.partition(".")[0]
         # Skip if the node type is not recognized (e.g., "analysis", "docs", etc.)
-        if node_type not in dependency_graph.keys():
+        if node_type not in manifest_key_mapping:
             continue
-        elif manifest_key is None:
-            print(f"Unknown node type '{node_type}' found in manifest file. Exiting.")
-            sys.exit(1)
-        elif full_item is None:
-            print(f"Item '{key}' not found in manifest file under '{manifest_key}'. Skipping.")
+
+        # Every tracked type resolves through the single flattened lookup
+        full_item = manifest_items.get(key)
+        if full_item is None:
+            print(f"Item '{key}' not found in manifest file under '{manifest_key_mapping[node_type]}'. Skipping.")
             continue
         
         name = full_item.get("name", None)
-        compiled_code = full_item.get("compiled_code", None)
+        # Compiled SQL is usually the largest field of a node; only keep it when asked to
+        compiled_code = full_item.get("compiled_code", None) if include_compiled_code else None
         original_file_path = full_item.get("original_file_path", None)
 
         #if node_type == "seed" and original_file_path:
@@ -78,26 +142,22 @@ def generate_dependency_graph(manifest_file_path: str, is_state_manifest: bool =
         #        seed_file_path=original_file_path
         #    )
 
-        node_type_map: Dict[str, set] = {
-            "model": set(),
-            "macro": set(),
-            "seed": set(),
-            "snapshot": set(),
-            "source": set(),
-            "test": set(),
-            "exposure": set(),
-        }
-            
+        # Group the children by resource type first, then resolve each group's names in one pass
+        dependency_ids_by_type: Dict[str, List[str]] = defaultdict(list)
         for dep_id in downstream_dependencies:
-            dep_type = dep_id.split(".")[0]
-            dep_manifest_key = manifest_key_mapping.get(dep_type)
-            
-            if dep_manifest_key and dep_type in node_type_map:
-                dep_item = manifest_file.get(dep_manifest_key, {}).get(dep_id, None)
-                if dep_item:
-                    dep_name = dep_item.get("name")
-                    if dep_name:
-                        node_type_map[dep_type].add(dep_name)
+            dependency_ids_by_type[dep_id.partition(".")[0]].append(dep_id)
+
+        node_type_map: Dict[str, Any] = dict.fromkeys(DEPENDENCY_TYPES, EMPTY_DEPENDENCIES)
+        for dep_type, dep_ids in dependency_ids_by_type.items():
+            if dep_type not in node_type_map:
+                continue
+            dep_names = {
+                dep_name
+                for dep_item in map(manifest_items.get, dep_ids)
+                if dep_item and (dep_name := dep_item.get("name"))
+            }
+            if dep_names:
+                node_type_map[dep_type] = dep_names
 
         dependency_graph[node_type][name] = {
             "name": name,
@@ -108,22 +168,17 @@ def generate_dependency_graph(manifest_file_path: str, is_state_manifest: bool =
             "original_file_path": original_file_path,
             "compiled_path": full_item.get("compiled_path", None),
             "compiled_code": compiled_code,
-            "columns": set(full_item.get("columns", {}).keys()),
+            # Dict keys are already unique, so keep them as a list rather than building a set
+            "columns": list(full_item.get("columns", {})),
             "downstream_dependencies": {
                 "node_dependencies": set(downstream_dependencies),
-                "dependencies_by_type": {
-                    "model": node_type_map["model"],
-                    "macro": node_type_map["macro"],
-                    "seed": node_type_map["seed"],
-                    "snapshot": node_type_map["snapshot"],
-                    "source": node_type_map["source"],
-                    "test": node_type_map["test"],
-                    "exposure": node_type_map["exposure"],
-                }
+                "dependencies_by_type": node_type_map,
+            },
+            # Per-type sets are created lazily; the indirect_* entries are assigned by append_indirect_dependencies
+            "upstream_dependencies": {
+                "node_dependencies": set(),
+                "dependencies_by_type": dict.fromkeys(DEPENDENCY_TYPES, EMPTY_DEPENDENCIES),
             },
-            "upstream_dependencies": skeleton_dependencies_structure(),
-            "indirect_upstream_dependencies": skeleton_dependencies_structure(),
-            "indirect_downstream_dependencies": skeleton_dependencies_structure(),
         }
 
         #print(full_item.get("depends_on", {}).get("macros", []))
@@ -132,35 +187,243 @@ def generate_dependency_graph(manifest_file_path: str, is_state_manifest: bool =
             node_type=node_type,
             name=name,
             dependencies=full_item.get("depends_on", {}), 
-            manifest_file=manifest_file
+            manifest_items=manifest_items
+        )
+
+    append_upstream_dependencies(dependency_graph, parent_map, manifest_items)
+
+    # Index the final graph by unique id so transitive lookups are O(1) instead of scanning a node type
+    id_to_node: Dict[str, DependencyGraphNode] = {
+        node_data["id"]: node_data
+        for node_type, nodes in dependency_graph.items() if node_type != "metadata"
+        for node_data in nodes.values()
+    }
+    append_indirect_dependencies(dependency_graph, id_to_node)
+    freeze_dependencies(dependency_graph)
+
+    return dependency_graph
+
+def freeze_dependencies(dependency_graph: DependencyGraph) -> None:
+    """Replace every dependency set in the finished graph with a frozenset, in place.
+
+    Frozensets are smaller than sets, and every empty one collapses onto the shared
+    EMPTY_DEPENDENCIES, which most nodes need for several resource types.
+    """
+    for node_type, nodes in dependency_graph.items():
+        if node_type == "metadata":
+            continue
+        for node_data in nodes.values():
+            for dependency_key in DEPENDENCY_KEYS:
+                dependencies = node_data[dependency_key]
+                dependencies["node_dependencies"] = frozenset(dependencies["node_dependencies"]) or EMPTY_DEPENDENCIES
+                by_type = dependencies["dependencies_by_type"]
+                for dep_type, members in by_type.items():
+                    if members is not EMPTY_DEPENDENCIES:
+                        by_type[dep_type] = frozenset(members) or EMPTY_DEPENDENCIES
+
+def manifest_digest(manifest_path: str) -> str:
+    """Return the SHA-256 hex digest of a manifest file's bytes."""
+    with open(manifest_path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def dependency_graph_cache_dir() -> Optional[str]:
+    """Return the directory holding dependency graph caches, creating it if needed.
+
+    DBT_CI_CACHE_DIR when set, else dbt-ci under $XDG_CACHE_HOME (default ~/.cache). The cache
+    is owned by the tool rather than written next to manifests, which may sit in directories the
+    user does not expect us to touch (e.g. a downloaded --state artifact).
+
+    Returns None when DBT_CI_CACHE_DIR is set to an empty string (the cache is turned off) or the
+    directory cannot be created, e.g. on a read-only file system.
+    """
+    cache_dir = os.environ.get("DBT_CI_CACHE_DIR")
+    if cache_dir == "":
+        return None
+    if cache_dir is None:
+        cache_dir = os.path.join(
+            os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")),
+            "dbt-ci",
+        )
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    except OSError:
+        return None
+    return cache_dir
+
+def dependency_graph_cache_path(manifest_path: str) -> Optional[str]:
+    """Return the cache file for a manifest, named after the SHA-256 of its absolute path, or None without a cache dir."""
+    cache_dir = dependency_graph_cache_dir()
+    if cache_dir is None:
+        return None
+    path_digest = hashlib.sha256(os.path.abspath(manifest_path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, path_digest + DEPENDENCY_GRAPH_CACHE_SUFFIX)
+
+def write_dependency_graph_cache(cache_path: str, cache_key: list, dependency_graph: DependencyGraph) -> None:
+    """Atomically write the cache key line followed by the graph as JSON to cache_path."""
+    try:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(json_dumps(cache_key, indent=False) + b"\n")
+            file.write(json_dumps(dependency_graph, default=set_default, indent=False))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write dependency graph cache to '{cache_path}': {e}")
+
+def read_dependency_graph_cache(file: Any) -> DependencyGraph:
+    """Load a graph written by write_dependency_graph_cache, restoring interned ids and frozensets."""
+    dependency_graph = json_loads(file.read())
+    for node_type, nodes in dependency_graph.items():
+        if node_type == "metadata":
+            continue
+        for node_data in nodes.values():
+            node_data["id"] = sys.intern(node_data["id"])
+            for dependency_key in DEPENDENCY_KEYS:
+                dependencies = node_data[dependency_key]
+                dependencies["node_dependencies"] = [sys.intern(dep_id) for dep_id in dependencies["node_dependencies"]]
+                by_type = dependencies["dependencies_by_type"]
+                for dep_type, members in by_type.items():
+                    by_type[dep_type] = [sys.intern(dep_id) for dep_id in members]
+    freeze_dependencies(dependency_graph)
+    return dependency_graph
+
+def generate_cached_dependency_graph(
+    manifest_file_path: str,
+    is_state_manifest: bool = False,
+    include_compiled_code: bool = False,
+    use_cache: bool = True
+) -> DependencyGraph:
+    """Generate dependency graph from manifest file, reusing a cached copy when the manifest is unchanged.
+
+    The cache is plain JSON in dependency_graph_cache_dir(), one file per manifest path, and is keyed
+    on the manifest's mtime, size and SHA-256 digest, plus include_compiled_code. A matching mtime and size is trusted as is; when only
+    the mtime differs (e.g. a fresh CI checkout or a restored artifact) the digest decides, and a hit
+    refreshes the stored mtime. Failing to read or write the cache silently falls back to a full parse.
+
+    Args:
+        manifest_file_path: Path to dbt project dir (looks in target/) or state dir (looks for manifest.json directly)
+        is_state_manifest: If True, load from {path}/manifest.json; if False, load from {path}/target/manifest.json
+        include_compiled_code: If True, copy each node's compiled SQL into the graph; otherwise store None
+        use_cache: If False, skip the cache entirely and always build the graph
+    """
+    manifest_path = get_prod_manifest_path(manifest_file_path) if is_state_manifest else get_manifest_path(manifest_file_path)
+
+    try:
+        stat = os.stat(manifest_path)
+        cache_path = dependency_graph_cache_path(manifest_path) if use_cache else None
+    except OSError:
+        # Let the regular loader raise its descriptive FileNotFoundError
+        cache_path = None
+    if cache_path is None:
+        return generate_dependency_graph(
+            manifest_file_path,
+            is_state_manifest=is_state_manifest,
+            include_compiled_code=include_compiled_code
         )
 
-    append_upstream_dependencies(dependency_graph, manifest_file)
-    append_indirect_dependencies(dependency_graph, "upstream")
-    append_indirect_dependencies(dependency_graph, "downstream")
+    graph_key = [DEPENDENCY_GRAPH_CACHE_VERSION, include_compiled_code]
+    stat_key = graph_key + [stat.st_mtime_ns, stat.st_size]
+    digest = None
+
+    try:
+        with open(cache_path, "rb") as file:
+            # The key sits on its own first line so a stale cache is rejected without loading the graph
+            cached_key = json_loads(file.readline())
+            if cached_key[:4] == stat_key:
+                return read_dependency_graph_cache(file)
+            if cached_key[:2] == graph_key and cached_key[3] == stat.st_size:
+                digest = manifest_digest(manifest_path)
+                if cached_key[4] == digest:
+                    dependency_graph = read_dependency_graph_cache(file)
+                    write_dependency_graph_cache(cache_path, stat_key + [digest], dependency_graph)
+                    return dependency_graph
+    except (OSError, ValueError, IndexError, TypeError, KeyError, AttributeError):
+        pass
+
+    dependency_graph = generate_dependency_graph(
+        manifest_file_path,
+        is_state_manifest=is_state_manifest,
+        include_compiled_code=include_compiled_code
+    )
+
+    try:
+        digest = digest or manifest_digest(manifest_path)
+    except OSError:
+        return dependency_graph
+    write_dependency_graph_cache(cache_path, stat_key + [digest], dependency_graph)
 
     return dependency_graph
 
+def build_downstream_adjacency(dependency_graph: DependencyGraph) -> DownstreamAdjacency:
+    """Flatten the downstream edges of the graph into CSR integer arrays.
+
+    Edges pointing at ids that are not part of the graph (e.g. analyses) are dropped.
+    """
+    node_ids = [
+        node["id"]
+        for node_type, nodes in dependency_graph.items() if node_type != "metadata"
+        for node in nodes.values()
+    ]
+    id_to_idx = {node_id: idx for idx, node_id in enumerate(node_ids)}
+    indptr = array("I", [0])
+    indices = array("I")
+
+    for node_type, nodes in dependency_graph.items():
+        if node_type == "metadata":
+            continue
+        for node in nodes.values():
+            indices.extend(
+                id_to_idx[child_id]
+                for child_id in node["downstream_dependencies"]["node_dependencies"]
+                if child_id in id_to_idx
+            )
+            indptr.append(len(indices))
+
+    return {
+        "node_ids": node_ids,
+        "id_to_idx": id_to_idx,
+        "indptr": indptr,
+        "indices": indices,
+    }
+
+def downstream_closure(adjacency: DownstreamAdjacency, start_ids: Set[str]) -> Set[str]:
+    """Return start_ids plus every node reachable from them through downstream edges."""
+    id_to_idx = adjacency["id_to_idx"]
+    indptr = adjacency["indptr"]
+    indices = adjacency["indices"]
+    visited = bytearray(len(adjacency["node_ids"]))
+
+    queue = [id_to_idx[node_id] for node_id in start_ids if node_id in id_to_idx]
+    for idx in queue:
+        visited[idx] = 1
+
+    while queue:
+        idx = queue.pop()
+        for child_idx in indices[indptr[idx]:indptr[idx + 1]]:
+            if not visited[child_idx]:
+                visited[child_idx] = 1
+                queue.append(child_idx)
+
+    node_ids = adjacency["node_ids"]
+    return {node_ids[idx] for idx, flag in enumerate(visited) if flag}
+
 def append_depends_on_nodes(
     dependency_graph: DependencyGraph,
     node_type: DependencyGraphNodeType,
     name: str,
     dependencies: Dict[DependencyGraphNodeType, List[str]], 
-    manifest_file: DBTManifest
+    manifest_items: Dict[str, Dict[str, Any]]
 ) -> None:
     for dep_type, dep_ids in dependencies.items():
         if dep_ids is None or not isinstance(dep_ids, list):
             continue
 
         # Add all dep_ids to node_dependencies
+        dep_ids = [sys.intern(dep_id) for dep_id in dep_ids]
         dependency_graph[node_type][name]["upstream_dependencies"]["node_dependencies"].update(dep_ids)
         
         # Retrieve name from manifest
         for dep_id in dep_ids:
-            # dep_type from depends_on is "nodes" or "macros"
-            # Look up in the correct manifest section
-            manifest_section = "macros" if dep_type == "macros" else "nodes"
-            node = manifest_file.get(manifest_section, {}).get(dep_id, None)
+            node = manifest_items.get(dep_id)
             
             if node is None:
                 continue
@@ -175,108 +438,181 @@ def append_depends_on_nodes(
                 dep_category = "macro"
             else:
                 # Extract actual type from dep_id (e.g., "model.project.name" -> "model")
-                dep_category = dep_id.split(".")[0]
+                dep_category = dep_id.partition(".")[0]
             
             # Only add if this category is tracked
             if dep_category in dependency_graph[node_type][name]["upstream_dependencies"]["dependencies_by_type"]:
-                dependency_graph[node_type][name]["upstream_dependencies"]["dependencies_by_type"][dep_category].add(node_name)
+                add_dependency_by_type(
+                    dependency_graph[node_type][name]["upstream_dependencies"]["dependencies_by_type"],
+                    dep_category,
+                    node_name
+                )
 
 def output_dependency_graph(dependency_graph: DependencyGraph, output_path: str) -> None:
-    with open(output_path, "w") as file:
-        json.dump(
-            obj=dependency_graph, 
-            fp=file, 
-            indent=4, 
-            default=lambda o: list(o) if isinstance(o, set) else o
-        )
+    # json_dumps returns UTF-8 bytes (orjson when installed), so write in binary mode
+    with open(output_path, "wb") as file:
+        file.write(json_dumps(dependency_graph, default=set_default))
 
-def find_node_by_id(dependency_graph, node_id):
-    """Find a node in dependency_graph by its ID"""
-    node_type = node_id.split(".")[0]
-    if node_type in dependency_graph:
-        for node_data in dependency_graph[node_type].values():
-            if node_data.get("id") == node_id:
-                return node_data
-    return None
+def compute_transitive_closures(adjacency: List[List[int]]) -> List[Set[int]]:
+    """Compute, for every node, the set of node indices reachable through its edges.
 
+    Nodes are finished in post-order with an explicit stack, so each node's closure is the union
+    of its direct dependencies and the already-computed closures of those dependencies. Every
+    subgraph is therefore walked once, and deep graphs cannot hit the recursion limit. Working on
+    small ints rather than unique id strings keeps the set unions cheap to hash and compare.
 
-def collect_dependencies_recursively(dependency_graph, node_data, visited, direction="upstream"):
-    """Recursively collect upstream or downstream dependencies"""
-    dep_key = "upstream_dependencies" if direction == "upstream" else "downstream_dependencies"
-    
-    for dep_id in node_data[dep_key]["node_dependencies"]:
-        if dep_id not in visited:
-            visited.add(dep_id)
-            dep_node = find_node_by_id(dependency_graph, dep_id)
-            if dep_node:
-                collect_dependencies_recursively(dependency_graph, dep_node, visited, direction)
+    Args:
+        adjacency: adjacency[i] holds the indices of node i's direct dependencies
+
+    Returns:
+        closures[i] is the set of indices reachable from node i (i itself only if it lies on a cycle)
+    """
+    closures: List[Optional[Set[int]]] = [None] * len(adjacency)
+    in_progress = bytearray(len(adjacency))
 
+    for root_idx in range(len(adjacency)):
+        if closures[root_idx] is not None:
+            continue
 
-def append_upstream_dependencies(dependency_graph, manifest_file):
-    """Populate upstream dependencies by reversing downstream dependencies"""
-    # Iterate through all nodes and their downstream dependencies
-    parent_map = manifest_file.get("parent_map", {})
+        stack = [(root_idx, False)]
+        while stack:
+            idx, children_done = stack.pop()
+            if closures[idx] is not None:
+                continue
+
+            direct = adjacency[idx]
+            if children_done:
+                closure = set(direct)
+                for dep_idx in direct:
+                    dep_closure = closures[dep_idx]
+                    if dep_closure:
+                        closure |= dep_closure
+                closures[idx] = closure
+                in_progress[idx] = 0
+                continue
 
+            in_progress[idx] = 1
+            stack.append((idx, True))
+            for dep_idx in direct:
+                if closures[dep_idx] is None and not in_progress[dep_idx]:
+                    stack.append((dep_idx, False))
+
+    return closures
+
+
+def append_upstream_dependencies(dependency_graph, parent_map, manifest_items):
+    """Populate upstream dependencies by reversing downstream dependencies
+
+    Args:
+        dependency_graph: The lineage map to populate
+        parent_map: Mapping of child unique id -> parent unique ids (child_map reversed)
+        manifest_items: Flattened mapping of unique id -> manifest item
+    """
+    # Iterate through all nodes and their downstream dependencies
     for child_id, parent_ids in parent_map.items():
         if len(parent_ids) == 0:
             continue
 
-        child_node_type = child_id.split(".")[0]
-        manifest_key = manifest_key_mapping.get(child_node_type)
-        node = manifest_file.get(manifest_key, {}).get(child_id, None).get("name", None)
+        child_node_type = child_id.partition(".")[0]
+        # Untracked resource types (e.g. analyses) are not part of the graph
+        if child_node_type not in dependency_graph or child_node_type == "metadata":
+            continue
+
+        child_item = manifest_items.get(child_id)
+        node = child_item.get("name", None) if child_item else None
 
-        if node is None:
-            print(f"Node with ID '{child_id}' not found in manifest file under '{manifest_key}'. Skipping.")
+        if node is None or node not in dependency_graph[child_node_type]:
+            print(f"Node with ID '{child_id}' not found in manifest file. Skipping.")
             continue
 
         dependency_graph[child_node_type][node]["upstream_dependencies"]["node_dependencies"].update(parent_ids)
 
         # Sort by dependency type
         for parent_id in parent_ids:
-            parent_node_type = parent_id.split(".")[0]
-            manifest_key = manifest_key_mapping.get(parent_node_type)
-            parent_node = manifest_file.get(manifest_key, {}).get(parent_id, None)
+            parent_node_type = parent_id.partition(".")[0]
+            parent_node = manifest_items.get(parent_id)
             name = parent_node.get("name", None) if parent_node else None
 
             if name is None:
-                print(f"Parent node with ID '{parent_id}' not found in manifest file under '{manifest_key}'. Skipping.")
+                print(f"Parent node with ID '{parent_id}' not found in manifest file. Skipping.")
                 continue
 
-            dependency_graph[child_node_type][node]["upstream_dependencies"]["dependencies_by_type"][parent_node_type].add(name)
+            add_dependency_by_type(
+                dependency_graph[child_node_type][node]["upstream_dependencies"]["dependencies_by_type"],
+                parent_node_type,
+                name
+            )
 
 
-def append_indirect_dependencies(dependency_graph, direction="upstream"):
-    """Populate indirect dependencies (transitive, excluding direct)
-    
+def append_indirect_dependencies(dependency_graph, id_to_node):
+    """Populate indirect upstream and downstream dependencies (transitive, excluding direct)
+
+    Both directions share one id -> int index and are built in the same walks over the graph:
+    one pass collects the upstream and downstream adjacency of every node, and one pass stores
+    both indirect entries. Ids are only turned back into unique id strings at that point.
+
     Args:
         dependency_graph: The lineage map to populate
-        direction: Either "upstream" or "downstream"
+        id_to_node: Mapping of unique id -> node for every node in dependency_graph
     """
-    direct_key = f"{direction}_dependencies"
-    indirect_key = f"indirect_{direction}_dependencies"
-    
-    for node_type, nodes in dependency_graph.items():
-        if node_type == "metadata":  # Skip metadata
-            continue
-        for node_data in nodes.values():
-            # Collect all transitive dependencies
-            all_indirect = set()
-            for direct_dep_id in node_data[direct_key]["node_dependencies"]:
-                dep_node = find_node_by_id(dependency_graph, direct_dep_id)
-                if dep_node:
-                    collect_dependencies_recursively(dependency_graph, dep_node, all_indirect, direction)
-            
-            # Store indirect dependencies (excluding direct)
-            node_data[indirect_key]["node_dependencies"] = all_indirect
-            
+    idx_to_id: List[str] = list(id_to_node)
+    id_to_idx: Dict[str, int] = {node_id: idx for idx, node_id in enumerate(idx_to_id)}
+    graph_size = len(idx_to_id)
+    idx_to_type: List[str] = [node_id.partition(".")[0] for node_id in idx_to_id]
+    idx_to_name: List[str] = []
+
+    def index_of(dep_id: str) -> int:
+        # Ids outside the graph (e.g. macros or analyses not in child_map) get an index of their
+        # own, so they still appear in closures as leaves without dependencies
+        idx = id_to_idx.get(dep_id)
+        if idx is None:
+            idx = id_to_idx[dep_id] = len(idx_to_id)
+            idx_to_id.append(dep_id)
+        return idx
+
+    adjacency: Dict[str, List[List[int]]] = {"upstream": [], "downstream": []}
+    for node in id_to_node.values():
+        idx_to_name.append(node["name"])
+        for direction, direction_adjacency in adjacency.items():
+            direction_adjacency.append([
+                index_of(dep_id)
+                for dep_id in node[f"{direction}_dependencies"]["node_dependencies"]
+            ])
+    for direction_adjacency in adjacency.values():
+        direction_adjacency.extend([] for _ in range(len(idx_to_id) - graph_size))
+
+    closures = {
+        direction: compute_transitive_closures(direction_adjacency)
+        for direction, direction_adjacency in adjacency.items()
+    }
+
+    for idx, node_data in enumerate(id_to_node.values()):
+        for direction, direction_adjacency in adjacency.items():
+            direction_closures = closures[direction]
+
+            # Everything reachable from the direct dependencies
+            all_indirect_idx: Set[int] = set()
+            for direct_dep_idx in direction_adjacency[idx]:
+                dep_closure = direction_closures[direct_dep_idx]
+                if dep_closure:
+                    all_indirect_idx |= dep_closure
+
             # Populate by type
-            for indirect_id in all_indirect:
-                indirect_node = find_node_by_id(dependency_graph, indirect_id)
-                if indirect_node:
-                    indirect_type = indirect_id.split(".")[0]
-                    # Only add to dependencies_by_type if the indirect_type is tracked
-                    if indirect_type in node_data[indirect_key]["dependencies_by_type"]:
-                        node_data[indirect_key]["dependencies_by_type"][indirect_type].add(indirect_node["name"])
+            dependencies_by_type = dict.fromkeys(DEPENDENCY_TYPES, EMPTY_DEPENDENCIES)
+            for indirect_idx in all_indirect_idx:
+                # Leaves outside the graph have no name to list by type
+                if indirect_idx >= graph_size:
+                    continue
+                indirect_type = idx_to_type[indirect_idx]
+                # Only add to dependencies_by_type if the indirect_type is tracked
+                if indirect_type in dependencies_by_type:
+                    add_dependency_by_type(dependencies_by_type, indirect_type, idx_to_name[indirect_idx])
+
+            # Store indirect dependencies (excluding direct)
+            node_data[f"indirect_{direction}_dependencies"] = {
+                "node_dependencies": {idx_to_id[indirect_idx] for indirect_idx in all_indirect_idx},
+                "dependencies_by_type": dependencies_by_type,
+            }
 
 """
 def parse_seed_file(manifest_file_path: str, seed_file_path: str) -> str:
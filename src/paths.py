@@ -1,31 +1,94 @@
 import os
+import threading
 import yaml
-import json
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 from src.schema import DBTManifest
+from src.utilities import json_load_file
 
-def get_manifest_file(dbt_project_dir: str) -> DBTManifest:
+# libyaml-backed loader when PyYAML was built with it; same safe semantics as yaml.safe_load
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def get_manifest_path(dbt_project_dir: str) -> str:
+    """Get the path to the manifest.json file in the target directory."""
+    return os.path.join(dbt_project_dir, "target/manifest.json")
+
+def get_prod_manifest_path(prod_manifest_dir: str) -> str:
+    """Get the path to the production/reference manifest.json file."""
+    return os.path.join(prod_manifest_dir, "manifest.json")
+
+def _load_manifest(file: str) -> DBTManifest:
+    """Load and decode a whole manifest.json."""
+    with open(file, 'rb') as f:
+        return json_load_file(f)
+
+# Per-path locks, so callers loading the same manifest concurrently share one decode
+_manifest_locks: Dict[str, threading.Lock] = {}
+_manifest_locks_guard = threading.Lock()
+
+# The target and the reference manifest
+@lru_cache(maxsize=2)
+def _load_manifest_memoized(file: str, mtime_ns: int, size: int) -> DBTManifest:
+    """Memoized _load_manifest; mtime and size are part of the key so a rewritten file is re-read."""
+    return _load_manifest(file)
+
+def _load_manifest_cached(file: str, sections: Optional[Tuple[str, ...]] = None) -> DBTManifest:
+    """
+    Load a manifest.json, reusing the parsed result while the file is unchanged on disk.
+    Only the full decode is memoized; a sections view is sliced from it, so it shares the section
+    objects instead of holding a second copy and never decodes the file again.
+    The returned dict is shared between callers and must be treated as read-only.
+    """
+    stat = os.stat(file)
+    path = os.path.abspath(file)
+    with _manifest_locks_guard:
+        lock = _manifest_locks.setdefault(path, threading.Lock())
+    # lru_cache does not stop two threads that miss together from both decoding the file
+    with lock:
+        manifest = _load_manifest_memoized(path, stat.st_mtime_ns, stat.st_size)
+    if sections is None:
+        return manifest
+    return {key: manifest[key] for key in sections if key in manifest}
+
+def get_manifest_file(dbt_project_dir: str, sections: Optional[Tuple[str, ...]] = None) -> DBTManifest:
     """
     Get the path to the manifest.json file in the target directory.
     Raises a FileNotFoundError if the file does not exist.
+    If sections is given, only those top-level keys of the manifest are returned.
     """
 
-    file = os.path.join(dbt_project_dir, "target/manifest.json")
-    if not os.path.isfile(file):
-        raise FileNotFoundError(f"manifest.json not found in {dbt_project_dir}")
-    with open(file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    file = get_manifest_path(dbt_project_dir)
+    try:
+        return _load_manifest_cached(file, sections)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise FileNotFoundError(f"manifest.json not found in {dbt_project_dir}") from None
     
-def get_prod_manifest_file(prod_manifest_dir: str) -> DBTManifest:
+def get_prod_manifest_file(prod_manifest_dir: str, sections: Optional[Tuple[str, ...]] = None) -> DBTManifest:
     """
     Get the path to the production/reference manifest.json file in the target directory.
     Raises a FileNotFoundError if the file does not exist.
+    If sections is given, only those top-level keys of the manifest are returned.
     """
 
-    file = os.path.join(prod_manifest_dir, "manifest.json")
-    if not os.path.isfile(file):
-        raise FileNotFoundError(f"manifest.json not found in {prod_manifest_dir}")
+    file = get_prod_manifest_path(prod_manifest_dir)
+    try:
+        return _load_manifest_cached(file, sections)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise FileNotFoundError(f"manifest.json not found in {prod_manifest_dir}") from None
+
+@lru_cache(maxsize=8)
+def _load_yaml_memoized(file: str, mtime_ns: int, size: int):
+    """Memoized YAML parse; mtime and size are part of the key so a rewritten file is re-read."""
     with open(file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        return yaml.load(f, Loader=YAML_LOADER)
+
+def _load_yaml_cached(file: str):
+    """
+    Load a YAML file, reusing the parsed result while the file is unchanged on disk.
+    The returned value is shared between callers and must be treated as read-only.
+    """
+    stat = os.stat(file)
+    return _load_yaml_memoized(os.path.abspath(file), stat.st_mtime_ns, stat.st_size)
 
 def get_dbt_project_file(dbt_project_dir: str) -> dict:
     """
@@ -33,13 +96,19 @@ def get_dbt_project_file(dbt_project_dir: str) -> dict:
     Raises a FileNotFoundError if the file does not exist.
     """
     file = os.path.join(dbt_project_dir, "dbt_project.yml")
-    if not os.path.isfile(file):
-        raise FileNotFoundError(f"dbt_project.yml not found in {dbt_project_dir}")
-    
-    with open(file, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    try:
+        return _load_yaml_cached(file)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise FileNotFoundError(f"dbt_project.yml not found in {dbt_project_dir}") from None
 
 
+def _try_load_yaml(file: str):
+    """Load a YAML file through the cache, or return None if it does not exist."""
+    try:
+        return _load_yaml_cached(file)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
 def get_profiles_file(
     dbt_project_dir: str,
     profiles_dir: str | None = None
@@ -49,25 +118,18 @@ def get_profiles_file(
     Raises a FileNotFoundError if the file does not exist in any of the expected locations
     """
     if profiles_dir:
-        file = os.path.join(profiles_dir, "profiles.yml")
-        if not os.path.isfile(file):
+        profile = _try_load_yaml(os.path.join(profiles_dir, "profiles.yml"))
+        if profile is None:
             raise FileNotFoundError(f"profiles.yml not found in {profiles_dir}")
-        
-        with open(file, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    else:
-        # Check for profiles.yml in the dbt project directory
-        file = os.path.join(dbt_project_dir, "profiles.yml")
-        if os.path.isfile(file):
-            with open(file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        
-        # Check for profiles.yml in the user's home directory
-        home_dir = os.path.expanduser("~")
-        file = os.path.join(home_dir, ".dbt/profiles.yml")
-        if os.path.isfile(file):
-            with open(file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        
-        raise FileNotFoundError("profiles.yml not found in the specified profiles directory, dbt project directory, or ~/.dbt/")
+        return profile
+
+    # Check the dbt project directory first, then the user's home directory
+    for file in (
+        os.path.join(dbt_project_dir, "profiles.yml"),
+        os.path.join(os.path.expanduser("~"), ".dbt/profiles.yml"),
+    ):
+        profile = _try_load_yaml(file)
+        if profile is not None:
+            return profile
 
+    raise FileNotFoundError("profiles.yml not found in the specified profiles directory, dbt project directory, or ~/.dbt/")
@@ -1,15 +1,25 @@
 """Central dispatcher for running dbt commands across different runners."""
 import os
+import shutil
 import sys
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.util import find_spec
 from subprocess import CompletedProcess
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from src.schema import RunnerConfig
-from src.runners.dbt import dbt_runner
+from src.utilities import run_multithreaded
+from src.runners.dbt import dbt_runner, parse_manifest
 from src.runners.local import local_runner
-from src.runners.docker import docker_runner
+from src.runners.docker import docker_exec_runner, docker_runner, docker_runner_session
 from src.runners.bash import bash_runner
 
 
+# dbt flags whose value is a path; made absolute for the local and dbt runners
+PATH_FLAGS = frozenset({'--state', '--project-dir', '--profiles-dir', '--target-path', '--log-path'})
+
+
 def _get_absolute_path(path: str) -> str:
     """Convert path to absolute if it's relative."""
     if not path:
@@ -17,17 +27,185 @@ def _get_absolute_path(path: str) -> str:
     return os.path.abspath(path) if not os.path.isabs(path) else path
 
 
+def _absolutize_path_args(command: List[str]) -> List[str]:
+    """Return command with the value following each of PATH_FLAGS made absolute."""
+    absolute_command = []
+    prev_arg = None
+    for arg in command:
+        if prev_arg in PATH_FLAGS and isinstance(arg, str):
+            absolute_command.append(_get_absolute_path(arg))
+        else:
+            absolute_command.append(arg)
+        prev_arg = arg
+    return absolute_command
+
+
+@lru_cache(maxsize=1)
+def _dbt_importable() -> bool:
+    """Check once whether dbt-core can be imported in this interpreter."""
+    return find_spec("dbt") is not None and find_spec("dbt.cli") is not None
+
+
+def _dbt_on_path_is_importable() -> bool:
+    """Whether the `dbt` on PATH belongs to this interpreter's environment, so the Python API runs the same dbt and adapters."""
+    dbt_path = shutil.which("dbt")
+    if dbt_path is None or not _dbt_importable():
+        return False
+    return os.path.realpath(dbt_path).startswith(os.path.realpath(sys.prefix) + os.sep)
+
+
+# dbt subcommands that load the project manifest, and so can be handed a preloaded one
+MANIFEST_COMMANDS = frozenset({
+    'build', 'clone', 'compile', 'docs', 'list', 'ls', 'retry', 'run', 'run-operation',
+    'seed', 'show', 'snapshot', 'source', 'test',
+})
+
+# Files whose changes make a parsed Manifest stale, and project dirs that never affect it
+_PROJECT_FILE_SUFFIXES = ('.sql', '.yml', '.yaml', '.py', '.csv', '.md', '.jinja')
+_PROJECT_SKIP_DIRS = frozenset({'target', 'logs', '.git', '.venv', 'venv', 'node_modules', '__pycache__'})
+
+# (project dir, profiles dir, profile, target, target path, vars) -> (project fingerprint, Manifest from `dbt parse`)
+_parsed_manifests: Dict[Tuple[Optional[str], ...], Tuple[Tuple[Any, ...], Any]] = {}
+_parsed_manifests_lock = threading.Lock()
+
+
+def _flag_value(command_args: List[str], flags: Tuple[str, ...]) -> Optional[str]:
+    """The value of the last of flags in command_args, like dbt itself.
+
+    Accepts `--flag value`, `--flag=value` and, for short flags, `-fvalue`.
+    """
+    value = None
+    for i, arg in enumerate(command_args):
+        if not isinstance(arg, str):
+            continue
+        if arg in flags and i + 1 < len(command_args):
+            value = command_args[i + 1]
+        elif arg.startswith('--') and '=' in arg and arg.split('=', 1)[0] in flags:
+            value = arg.split('=', 1)[1]
+        elif not arg.startswith('--') and arg[:2] in flags and len(arg) > 2:
+            value = arg[2:]
+    return value
+
+
+def _project_fingerprint(project_dir: str, profiles_dir: Optional[str]) -> Tuple[Any, ...]:
+    """Path, mtime and size of every file that feeds `dbt parse`, so edits and `dbt deps` invalidate a cached Manifest."""
+    entries = []
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = [d for d in dirs if d not in _PROJECT_SKIP_DIRS]
+        for name in files:
+            if name.endswith(_PROJECT_FILE_SUFFIXES):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime_ns, stat.st_size))
+    # dbt falls back to the project dir, then ~/.dbt, when no profiles dir is given
+    profiles_dirs = [profiles_dir] if profiles_dir else [project_dir, os.path.expanduser('~/.dbt')]
+    for directory in profiles_dirs:
+        try:
+            stat = os.stat(os.path.join(directory, 'profiles.yml'))
+        except OSError:
+            continue
+        entries.append((directory, stat.st_mtime_ns, stat.st_size))
+    entries.sort()
+    return tuple(entries)
+
+
+def parse_manifest_once(runner_config: RunnerConfig, command_args: Optional[List[str]] = None) -> Any:
+    """
+    Parse the project with the dbt Python API, reusing the result while the project is unchanged.
+
+    The project dir, profiles dir, profile, target, target path and vars come from command_args
+    where it sets them (the command is run against that Manifest), else from runner_config. The
+    Manifest is cached per combination of those; it is parsed again when a project file, an
+    installed package or profiles.yml has changed since. Inputs read through env_var() are not
+    tracked, which is why reuse is opt-in (reuse_manifest in the runner config).
+
+    Returns:
+        The parsed dbt Manifest, or None if parsing failed; a failed parse is not cached
+    """
+    command_args = command_args or []
+    project_dir = _flag_value(command_args, ('--project-dir',)) or runner_config['dbt_project_dir']
+    project_dir = _get_absolute_path(project_dir)
+    profiles_dir = _flag_value(command_args, ('--profiles-dir',)) or runner_config.get('profiles_dir')
+    profiles_dir = _get_absolute_path(profiles_dir) if profiles_dir else None
+    profile = _flag_value(command_args, ('--profile',))
+    target = _flag_value(command_args, ('--target', '-t')) or runner_config.get('target')
+    target_path = _flag_value(command_args, ('--target-path',))
+    target_path = _get_absolute_path(target_path) if target_path else None
+    dbt_vars = _flag_value(command_args, ('--vars',)) or runner_config.get('vars')
+    key = (project_dir, profiles_dir, profile, target, target_path, dbt_vars)
+
+    # Walking the project can take a while; do it before taking the lock so parallel commands
+    # only queue behind an actual parse
+    fingerprint = _project_fingerprint(project_dir, profiles_dir)
+    with _parsed_manifests_lock:
+        cached = _parsed_manifests.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        manifest = parse_manifest(
+            [
+                "parse",
+                "--project-dir", project_dir,
+                *(["--profiles-dir", profiles_dir] if profiles_dir else []),
+                *(["--profile", profile] if profile else []),
+                *(["--target", target] if target else []),
+                *(["--target-path", target_path] if target_path else []),
+                *(["--vars", dbt_vars] if dbt_vars else []),
+            ],
+            reuse_runner=runner_config.get('reuse_runner', True)
+        )
+        if manifest is None:
+            # Leave nothing cached so the next command tries again
+            _parsed_manifests.pop(key, None)
+            print(f"Could not parse the dbt project in {project_dir}; commands will parse it themselves")
+            return None
+        _parsed_manifests[key] = (fingerprint, manifest)
+        return manifest
+
+
+def _manifest_for_command(command_args: List[str], runner_config: RunnerConfig, manifest: Any, dry_run: bool) -> Any:
+    """The manifest to hand to an in-process dbt command: the caller's, else (with reuse_manifest) a parse matching the command's flags."""
+    if manifest is not None or dry_run or not runner_config.get('reuse_manifest', False):
+        return manifest
+    subcommand = next((arg for arg in command_args if not arg.startswith('-')), None)
+    if subcommand not in MANIFEST_COMMANDS:
+        return None
+    return parse_manifest_once(runner_config, command_args)
+
+
+def _docker_runner_kwargs(runner_config: RunnerConfig) -> Dict[str, Any]:
+    """Docker runner settings from the config; host paths are made absolute for the volume mounts."""
+    return {
+        "dbt_project_dir": _get_absolute_path(runner_config['dbt_project_dir']),
+        "profiles_dir": _get_absolute_path(runner_config['profiles_dir']) if runner_config.get('profiles_dir') else None,
+        "state_dir": _get_absolute_path(runner_config['prod_manifest_dir']),
+        "docker_image": runner_config.get('docker_image', 'ghcr.io/dbt-labs/dbt-core:latest'),
+        "docker_platform": runner_config.get('docker_platform'),
+        "docker_volumes": runner_config.get('docker_volumes', []),
+        "docker_env": runner_config.get('docker_env', []),
+        "docker_network": runner_config.get('docker_network', 'host'),
+        "docker_user": runner_config.get('docker_user'),
+        "docker_args": runner_config.get('docker_args', ''),
+    }
+
+
 def run_dbt_command(
     command_args: List[str],
     runner_config: RunnerConfig,
     dry_run: Optional[bool] = None,
-    quiet: Optional[bool] = None
+    quiet: Optional[bool] = None,
+    manifest: Optional[Any] = None,
+    capture_stdout: bool = True
 ) -> CompletedProcess | None:
     """
     Central dispatcher for running dbt commands across any runner.
     
     Handles:
-    - Runner routing (local, docker, bash)
+    - Runner routing (local, docker, bash, dbt); with local_in_process set, the local runner goes
+      through the dbt Python API instead of spawning a process when the entrypoint is plain `dbt`
+      and the dbt on PATH belongs to this interpreter
     - Path resolution based on runner requirements
     - Consistent error handling
     
@@ -36,6 +214,12 @@ def run_dbt_command(
         runner_config: Configuration containing runner type, paths, and runner-specific settings
         dry_run: Override config dry_run setting
         quiet: Override config quiet setting
+        manifest: Already parsed dbt Manifest; the dbt Python API reuses it instead of parsing the
+            project again. Without one, commands that load the manifest use the one from
+            parse_manifest_once when the config sets reuse_manifest. Ignored by
+            runners that spawn a process.
+        capture_stdout: Set to False when the output is not needed; with quiet, runners that spawn a
+            process then discard stdout instead of collecting and decoding it
     
     Returns:
         CompletedProcess from subprocess, or None if dry_run
@@ -64,21 +248,27 @@ def run_dbt_command(
     if runner == "local":
         # Local runner: use absolute paths for reliability
         # Replace paths in command with absolute versions
-        absolute_command = []
-        path_flags = {'--state', '--project-dir', '--profiles-dir', '--target-path', '--log-path'}
-        prev_arg = None
+        absolute_command = _absolutize_path_args(full_command)
         
-        for arg in full_command:
-            if prev_arg in path_flags and isinstance(arg, str):
-                absolute_command.append(_get_absolute_path(arg))
-            else:
-                absolute_command.append(arg)
-            prev_arg = arg
+        # Opt-in: skips the per-call interpreter and plugin startup, but only when the dbt on PATH
+        # is this interpreter's, since another install may differ in version or adapters
+        if entrypoint == "dbt" and runner_config.get('local_in_process', False) and _dbt_on_path_is_importable():
+            return dbt_runner(
+                absolute_command[1:],
+                dry_run=use_dry_run,
+                quiet=use_quiet,
+                reuse_runner=runner_config.get('reuse_runner', True),
+                manifest=_manifest_for_command(absolute_command[1:], runner_config, manifest, use_dry_run),
+                # Fail the same way local_runner does, so callers never mistake a failure for empty output
+                check=True,
+                capture_stdout=capture_stdout
+            )
         
         return local_runner(
             absolute_command,
             dry_run=use_dry_run,
-            quiet=use_quiet
+            quiet=use_quiet,
+            capture_stdout=capture_stdout
         )
     elif runner == "dbt":
         # Direct dbt runner: uses dbt Python API
@@ -86,21 +276,14 @@ def run_dbt_command(
         dbt_command_args = command_args if not entrypoint else full_command[1:]
         
         # Convert paths to absolute for reliability
-        absolute_command = []
-        path_flags = {'--state', '--project-dir', '--profiles-dir', '--target-path', '--log-path'}
-        prev_arg = None
-        
-        for arg in dbt_command_args:
-            if prev_arg in path_flags and isinstance(arg, str):
-                absolute_command.append(_get_absolute_path(arg))
-            else:
-                absolute_command.append(arg)
-            prev_arg = arg
+        absolute_command = _absolutize_path_args(dbt_command_args)
         
         return dbt_runner(
             absolute_command,
             dry_run=use_dry_run,
-            quiet=use_quiet
+            quiet=use_quiet,
+            reuse_runner=runner_config.get('reuse_runner', True),
+            manifest=_manifest_for_command(absolute_command, runner_config, manifest, use_dry_run)
         )
     elif runner == "bash":
         # Bash runner: pass paths as-is, let the script handle translation
@@ -108,30 +291,182 @@ def run_dbt_command(
             commands=full_command,
             dry_run=use_dry_run,
             shell_path=runner_config['shell_path'],
-            quiet=use_quiet
+            quiet=use_quiet,
+            capture_stdout=capture_stdout
         )
     
     elif runner == "docker":
         # Docker runner: needs absolute paths for volume mounts
         # Remove entrypoint from command (docker runner adds it back)
         docker_command = command_args if not entrypoint else full_command[1:]
+        docker_kwargs = _docker_runner_kwargs(runner_config)
+        
+        # Inside docker_session: run in the long-lived container instead of starting a new one
+        if runner_config.get('docker_container'):
+            return docker_exec_runner(
+                commands=docker_command,
+                container=runner_config['docker_container'],
+                dbt_project_dir=docker_kwargs['dbt_project_dir'],
+                profiles_dir=docker_kwargs['profiles_dir'],
+                state_dir=docker_kwargs['state_dir'],
+                entrypoint=entrypoint or 'dbt',
+                dry_run=use_dry_run,
+                quiet=use_quiet,
+                capture_stdout=capture_stdout
+            )
         
         return docker_runner(
             commands=docker_command,
-            dbt_project_dir=_get_absolute_path(runner_config['dbt_project_dir']),
-            profiles_dir=_get_absolute_path(runner_config['profiles_dir']) if runner_config.get('profiles_dir') else None,
-            state_dir=_get_absolute_path(runner_config['prod_manifest_dir']),
-            docker_image=runner_config.get('docker_image', 'ghcr.io/dbt-labs/dbt-core:latest'),
-            docker_platform=runner_config.get('docker_platform'),
-            docker_volumes=runner_config.get('docker_volumes', []),
-            docker_env=runner_config.get('docker_env', []),
-            docker_network=runner_config.get('docker_network', 'host'),
-            docker_user=runner_config.get('docker_user'),
-            docker_args=runner_config.get('docker_args', ''),
+            **docker_kwargs,
             dry_run=use_dry_run,
-            quiet=use_quiet
+            quiet=use_quiet,
+            capture_stdout=capture_stdout
         )
     
     else:
         print(f"Unsupported runner: {runner}")
         sys.exit(1)
+
+
+def run_dbt_commands_batch(
+    command_args_list: List[List[str]],
+    runner_config: RunnerConfig,
+    dry_run: Optional[bool] = None,
+    quiet: Optional[bool] = None,
+    manifest: Optional[Any] = None
+) -> List[CompletedProcess | None]:
+    """
+    Run several dbt commands in order, sharing the runner's set-up cost across them.
+
+    The docker runner runs them all in one docker_session container instead of starting one per
+    command; each command is its own `docker exec`, with its own exit code and output.
+    The dbt runner (and the local runner when it is routed through the dbt Python API) already
+    reuses one dbtRunner, so those commands simply run back to back. Other runners fall back to
+    one run_dbt_command call per command.
+
+    Args:
+        command_args_list: dbt command arguments for each command, without the entrypoint
+        runner_config: Configuration containing runner type, paths, and runner-specific settings
+        dry_run: Override config dry_run setting
+        quiet: Override config quiet setting
+        manifest: Already parsed dbt Manifest, passed on to run_dbt_command
+
+    Returns:
+        One CompletedProcess (or None if dry_run) per command, in the same order
+    """
+    use_dry_run = dry_run if dry_run is not None else runner_config.get('dry_run', False)
+    if runner_config['runner'] == "docker" and not runner_config.get('docker_container') and not use_dry_run:
+        with docker_session(runner_config) as session_config:
+            return run_dbt_commands_batch(command_args_list, session_config, dry_run=dry_run, quiet=quiet, manifest=manifest)
+
+    return [
+        run_dbt_command(command_args, runner_config, dry_run=dry_run, quiet=quiet, manifest=manifest)
+        for command_args in command_args_list
+    ]
+
+
+def run_dbt_commands_parallel(
+    command_args_list: List[List[str]],
+    runner_config: RunnerConfig,
+    threads: int = 4,
+    dry_run: Optional[bool] = None,
+    quiet: Optional[bool] = None,
+    manifest: Optional[Any] = None
+) -> List[CompletedProcess | None]:
+    """
+    Run independent dbt commands concurrently, e.g. one `dbt ls` per package or target.
+
+    Each command goes through run_dbt_command on its own thread. Runners that spawn a process
+    (local, bash, docker) run in parallel; in-process dbt invocations are serialized by dbt_runner,
+    since dbt is not safe to invoke from several threads at once. Output of commands that are not
+    quiet may interleave.
+
+    Args:
+        command_args_list: dbt command arguments for each command, without the entrypoint
+        runner_config: Configuration containing runner type, paths, and runner-specific settings
+        threads: Number of commands to run at the same time
+        dry_run: Override config dry_run setting
+        quiet: Override config quiet setting
+        manifest: Already parsed dbt Manifest, passed on to run_dbt_command
+
+    Returns:
+        One CompletedProcess (or None if dry_run) per command, in the same order
+
+    Raises:
+        The first exception raised by any of the commands, once all of them have finished.
+    """
+    results = run_multithreaded(
+        [
+            lambda command_args=command_args: run_dbt_command(
+                command_args, runner_config, dry_run=dry_run, quiet=quiet, manifest=manifest
+            )
+            for command_args in command_args_list
+        ],
+        threads=threads
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
+
+
+
+def run_dbt_command_merged(
+    base_command_args: List[str],
+    select_list: List[str],
+    runner_config: RunnerConfig,
+    dry_run: Optional[bool] = None,
+    quiet: Optional[bool] = None,
+    manifest: Optional[Any] = None
+) -> CompletedProcess | None:
+    """
+    Run one dbt command for a whole list of selectors instead of one command per selector.
+
+    dbt takes several space-separated selectors after a single --select, so
+    `dbt run --select a b c` does the work of three `dbt run --select x` calls while paying
+    the dbt start-up and project parse once. Prefer this over looping run_dbt_command
+    whenever the same command is run for many models.
+
+    Args:
+        base_command_args: dbt command arguments without --select (e.g., ['run', '--target', 'ci'])
+        select_list: Selectors to run; duplicates are dropped, order is kept
+        runner_config: Configuration containing runner type, paths, and runner-specific settings
+        dry_run: Override config dry_run setting
+        quiet: Override config quiet setting
+        manifest: Already parsed dbt Manifest, passed on to run_dbt_command
+
+    Returns:
+        CompletedProcess from the single invocation, or None if dry_run or select_list is empty
+    """
+    selectors = list(dict.fromkeys(select_list))
+    if not selectors:
+        return None
+
+    return run_dbt_command(
+        [*base_command_args, "--select", *selectors],
+        runner_config,
+        dry_run=dry_run,
+        quiet=quiet,
+        manifest=manifest
+    )
+
+@contextmanager
+def docker_session(runner_config: RunnerConfig) -> Iterator[RunnerConfig]:
+    """
+    Run every docker command issued inside the block in one long-lived container.
+
+    Yields a copy of runner_config whose commands go through `docker exec` against a container
+    started on entry and killed on exit. For other runners, or on a dry run, runner_config is
+    yielded unchanged.
+
+    Example:
+        with docker_session(config) as session_config:
+            run_dbt_command(['deps'], session_config)
+            run_dbt_command(['build', '--select', 'state:modified+'], session_config)
+    """
+    if runner_config['runner'] != "docker" or runner_config.get('dry_run', False):
+        yield runner_config
+        return
+
+    with docker_runner_session(**_docker_runner_kwargs(runner_config)) as container:
+        yield {**runner_config, 'docker_container': container}
@@ -1,13 +1,15 @@
 import sys
-from typing import List, Dict
+from typing import List
 import subprocess
 from subprocess import CompletedProcess
+from src.runners.process import run_process
 
 def bash_runner(
     commands: List[str],
     shell_path: str,
     dry_run: bool = False,
-    quiet: bool = False
+    quiet: bool = False,
+    capture_stdout: bool = True
 ) -> CompletedProcess | None:
     """
     Execute dbt commands using a custom dbt binary/script.
@@ -17,34 +19,14 @@ def bash_runner(
         shell_path: Path to the custom dbt executable to use (e.g., 'bin/dbt', '/usr/local/bin/dbt')
         dry_run: If True, only print the command
         quiet: If True, suppress stdout
+        capture_stdout: If False (and quiet), discard stdout instead of collecting it
     
     Note: The first element 'dbt' in commands will be replaced with shell_path
     """
     # Replace 'dbt' command with custom path
     commands = [shell_path] + commands
     
-    if not quiet:
-        print(f"Running command: {' '.join(commands)}")
-    
-    if dry_run:
-        print("DRY RUN: Command would be executed")
-        return None
-    
     try:
-        result = subprocess.run(
-            args=commands,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-
-        if not quiet:
-            print(result.stdout)
-
-        return result
-    except subprocess.CalledProcessError as e:
-        if e.stderr:
-            print(e.stderr)
-        if e.stdout:
-            print(e.stdout)
-        sys.exit(1)
\ No newline at end of file
+        return run_process(commands, dry_run=dry_run, quiet=quiet, capture_stdout=capture_stdout)
+    except subprocess.CalledProcessError:
+        sys.exit(1)
@@ -1,47 +1,124 @@
-from dbt.cli.main import dbtRunner, CatalogArtifact, Manifest, RunExecutionResult
-from subprocess import CompletedProcess
-from typing import List
+import shlex
+import threading
+from subprocess import CalledProcessError, CompletedProcess
+from typing import TYPE_CHECKING, Any, List, Optional
+
+if TYPE_CHECKING:
+    from dbt.cli.main import Manifest, dbtRunner
+
+# Shared dbtRunner; constructing one reloads adapters and plugins, so it is built once per process
+_shared_runner: Optional["dbtRunner"] = None
+# dbt keeps per-invocation state in globals, so in-process invocations must not overlap
+_invoke_lock = threading.Lock()
+
+def get_dbt_runner(reuse_runner: bool = True, manifest: Optional["Manifest"] = None) -> "dbtRunner":
+    """Return a dbtRunner, reusing the process-wide instance unless reuse_runner is False.
+
+    dbt is imported on first use so that the other runners work without dbt installed.
+    The runner hands manifest to its invocations so dbt skips parsing the project; None makes
+    them parse it as usual. Callers sharing the runner across threads must hold _invoke_lock
+    until their invocation is done.
+    """
+    global _shared_runner
+    from dbt.cli.main import dbtRunner
+
+    if not reuse_runner:
+        return dbtRunner(manifest=manifest)
+    if _shared_runner is None:
+        _shared_runner = dbtRunner(manifest=manifest)
+    else:
+        _shared_runner.manifest = manifest
+    return _shared_runner
+
+def _format_result(result: Any) -> str:
+    """Convert a dbtRunnerResult.result to stdout text.
+
+    `ls` returns a list of node names; run/test/build/seed/snapshot return a RunExecutionResult,
+    which is summarized one node per line instead of stringifying the whole result object.
+    """
+    from dbt.contracts.results import RunExecutionResult
+
+    if result is None:
+        return ""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, list):
+        return "\n".join(map(str, result))
+    if isinstance(result, RunExecutionResult):
+        return "\n".join(
+            f"{node_result.node.unique_id}  {node_result.status}  {node_result.execution_time:.2f}s"
+            for node_result in result.results
+        )
+    return str(result)
 
 def dbt_runner(
     commands: List[str], 
     dry_run: bool = False,
-    quiet: bool = False
+    quiet: bool = False,
+    reuse_runner: bool = True,
+    manifest: Optional["Manifest"] = None,
+    check: bool = False,
+    capture_stdout: bool = True
 ) -> CompletedProcess | None:
     """Execute dbt commands through dbtRunner (Python API).
     
     Returns a CompletedProcess-compatible object for consistency with other runners.
+    With reuse_runner, every call in the process shares one dbtRunner instead of building a new one.
+    A preloaded manifest, if given, is reused instead of parsing the project again.
+    With check, a failed invocation raises CalledProcessError like the subprocess runners do,
+    instead of returning a result with returncode 1.
+    With quiet and capture_stdout=False the result is not formatted and stdout is None, as with local_runner.
     """
-    runner = dbtRunner()
-
     if not quiet:
-        print(f"Running command: {' '.join(commands)}")
+        print(f"Running command: {shlex.join(commands)}")
     
     if dry_run:
         print("DRY RUN: Command would be executed")
         return None
     
     try:
-        result = runner.invoke(args=commands)
-
-        # Convert dbt result to stdout string format
-        # For 'ls' command, result.result is a list of node names
-        if isinstance(result.result, list):
-            stdout = "\n".join(result.result)
-        elif isinstance(result.result, str):
-            stdout = result.result
-        else:
-            stdout = str(result.result) if result.result is not None else ""
+        with _invoke_lock:
+            result = get_dbt_runner(reuse_runner, manifest).invoke(args=commands)
+
+        stdout = _format_result(result.result) if capture_stdout or not quiet else None
         
         if not quiet:
             print(stdout)
-        
-        # Return CompletedProcess for compatibility with other runners
-        return CompletedProcess(
-            args=commands,
-            returncode=0 if result.success else 1,
-            stdout=stdout,
-            stderr=""
-        )
     except BaseException as e:
         print(e)
-        raise
\ No newline at end of file
+        raise
+
+    stderr = str(result.exception) if result.exception is not None else ""
+    if check and not result.success:
+        if stderr:
+            print(stderr)
+        # stdout was already printed unless quiet
+        if quiet and stdout:
+            print(stdout)
+        raise CalledProcessError(1, commands, output=stdout, stderr=stderr)
+
+    # Return CompletedProcess for compatibility with other runners
+    return CompletedProcess(
+        args=commands,
+        returncode=0 if result.success else 1,
+        stdout=stdout,
+        stderr=stderr
+    )
+
+def parse_manifest(commands: List[str], reuse_runner: bool = True) -> Optional["Manifest"]:
+    """Run `dbt parse` with the given arguments and return the resulting Manifest.
+
+    Args:
+        commands: dbt arguments starting with "parse" (e.g., ['parse', '--project-dir', ...])
+        reuse_runner: Share the process-wide dbtRunner
+
+    Returns:
+        The parsed Manifest, or None if parsing failed
+    """
+    from dbt.cli.main import Manifest
+
+    with _invoke_lock:
+        result = get_dbt_runner(reuse_runner).invoke(args=commands)
+    if result.success and isinstance(result.result, Manifest):
+        return result.result
+    return None
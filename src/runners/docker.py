@@ -1,7 +1,69 @@
 import os
 import subprocess
+import uuid
+from contextlib import contextmanager
+from itertools import chain
 from subprocess import CompletedProcess
-from typing import List
+from src.runners.process import run_checked
+from typing import Iterator, List
+
+# Container paths
+CONTAINER_PROJECT_DIR = "/usr/app"
+CONTAINER_PROFILES_DIR = "/root/.dbt"
+CONTAINER_STATE_DIR = "/state"
+
+def _build_docker_run_command(
+    profiles_dir: str | None,
+    docker_image: str,
+    docker_platform: str | None = None,
+    docker_volumes: List[str] | None = None,
+    docker_env: List[str] | None = None,
+    docker_args: str = "",
+    entrypoint: str | None = None
+) -> List[str]:
+    """Build the `docker run ... IMAGE` prefix; the command to run in the container is appended by the caller."""
+    # Built as one list; the network and user options are not passed to docker for now
+    return [
+        "docker", "run",
+        # Platform if specified (useful for Apple Silicon Macs)
+        *(["--platform", docker_platform] if docker_platform else []),
+        # Profiles directory mount if specified
+        *([
+            "-v", f"{profiles_dir}:{CONTAINER_PROFILES_DIR}",
+            "-e", f"DBT_PROFILES_DIR={CONTAINER_PROFILES_DIR}",
+        ] if profiles_dir else []),
+        # Additional volumes and environment variables
+        *chain.from_iterable(("-v", volume) for volume in docker_volumes or ()),
+        *chain.from_iterable(("-e", env) for env in docker_env or ()),
+        # Additional docker args
+        *(docker_args.split() if docker_args else []),
+        # Override the image entrypoint (e.g. to run a shell script instead of dbt)
+        *(["--entrypoint", entrypoint] if entrypoint else []),
+        docker_image,
+    ]
+
+def _translate_command(
+    commands: List[str],
+    dbt_project_dir: str,
+    state_dir: str,
+    profiles_dir: str | None
+) -> List[str]:
+    """Translate dbt command paths to container paths, including `--flag=path` arguments."""
+    # setdefault keeps the earlier mapping when two of the host paths are the same directory
+    path_map = {dbt_project_dir: CONTAINER_PROJECT_DIR}
+    path_map.setdefault(state_dir, CONTAINER_STATE_DIR)
+    if profiles_dir:
+        path_map.setdefault(profiles_dir, CONTAINER_PROFILES_DIR)
+
+    translated_commands = []
+    for cmd_part in commands:
+        container_path = path_map.get(cmd_part)
+        if container_path is None and cmd_part.startswith("--"):
+            flag, sep, value = cmd_part.partition("=")
+            if sep and value in path_map:
+                container_path = f"{flag}={path_map[value]}"
+        translated_commands.append(container_path or cmd_part)
+    return translated_commands
 
 def docker_runner(
     commands: List[str],
@@ -16,7 +78,8 @@ def docker_runner(
     docker_user: str | None = None,
     docker_args: str = "",
     dry_run: bool = False,
-    quiet: bool = False
+    quiet: bool = False,
+    capture_stdout: bool = True
 ) -> CompletedProcess | None:
     """
     Execute dbt commands inside a Docker container.
@@ -35,88 +98,96 @@ def docker_runner(
         docker_args: Additional docker run arguments
         dry_run: If True, only print the command
         quiet: If True, suppress stdout
+        capture_stdout: If False (and quiet), discard stdout instead of collecting it
     """
     
-    docker_volumes = docker_volumes or []
-    docker_env = docker_env or []
-    
     # Auto-detect user if not specified
     if docker_user is None:
         docker_user = f"{os.getuid()}:{os.getgid()}"
     
-    # Container paths
-    container_project_dir = "/usr/app"
-    container_profiles_dir = "/root/.dbt"
-    container_state_dir = "/state"
-    
-    # Build Docker command
-    docker_cmd = ["docker", "run"]
-    
-    # Add platform if specified (useful for Apple Silicon Macs)
-    if docker_platform:
-        docker_cmd.extend(["--platform", docker_platform])
-    
-    # Add profiles directory mount if specified
-    if profiles_dir:
-        docker_cmd.extend(["-v", f"{profiles_dir}:{container_profiles_dir}"])
-        docker_cmd.extend(["-e", f"DBT_PROFILES_DIR={container_profiles_dir}"])
-    
-    # Add network mode
-    #docker_cmd.extend(["--network", docker_network])
-    
-    # Add user
-    #docker_cmd.extend(["--user", docker_user])
-    
-    # Add additional volumes
-    for volume in docker_volumes:
-        docker_cmd.extend(["-v", volume])
-    
-    # Add environment variables
-    for env in docker_env:
-        docker_cmd.extend(["-e", env])
-    
-    # Add additional docker args
-    if docker_args:
-        docker_cmd.extend(docker_args.split())
-    
-    # Add the Docker image
-    docker_cmd.append(docker_image)
-    
-    # Translate dbt command paths to container paths
-    translated_commands = []
-    for cmd_part in commands:
-        # Replace host paths with container paths in dbt command
-        if cmd_part == dbt_project_dir:
-            translated_commands.append(container_project_dir)
-        elif cmd_part == state_dir:
-            translated_commands.append(container_state_dir)
-        elif profiles_dir and cmd_part == profiles_dir:
-            translated_commands.append(container_profiles_dir)
-        else:
-            translated_commands.append(cmd_part)
+    docker_cmd = _build_docker_run_command(
+        profiles_dir=profiles_dir,
+        docker_image=docker_image,
+        docker_platform=docker_platform,
+        docker_volumes=docker_volumes,
+        docker_env=docker_env,
+        docker_args=docker_args
+    )
     
     # Add the dbt command
-    docker_cmd.extend(translated_commands)
+    docker_cmd.extend(_translate_command(commands, dbt_project_dir, state_dir, profiles_dir))
     
     if dry_run:
         print("DRY RUN: Command would be executed")
         return None
     
+    return run_checked(docker_cmd, quiet, capture_stdout=capture_stdout)
+
+def docker_exec_runner(
+    commands: List[str],
+    container: str,
+    dbt_project_dir: str,
+    profiles_dir: str | None,
+    state_dir: str,
+    entrypoint: str = "dbt",
+    dry_run: bool = False,
+    quiet: bool = False,
+    capture_stdout: bool = True
+) -> CompletedProcess | None:
+    """
+    Execute dbt commands in an already running container (see docker_runner_session).
+
+    Args:
+        commands: The dbt command and arguments to run, without the entrypoint
+        container: Name of the running container
+        entrypoint: Executable the command is run with inside the container (default: dbt)
+        Path arguments are the same as for docker_runner.
+    """
+    docker_cmd = [
+        "docker", "exec", container,
+        entrypoint,
+        *_translate_command(commands, dbt_project_dir, state_dir, profiles_dir),
+    ]
+
+    if dry_run:
+        print("DRY RUN: Command would be executed")
+        return None
+
+    return run_checked(docker_cmd, quiet, capture_stdout=capture_stdout)
+
+@contextmanager
+def docker_runner_session(
+    profiles_dir: str | None,
+    docker_image: str,
+    docker_platform: str | None = None,
+    docker_volumes: List[str] | None = None,
+    docker_env: List[str] | None = None,
+    docker_args: str = "",
+    **_: object
+) -> Iterator[str]:
+    """
+    Keep one container running for the duration of the block and yield its name.
+
+    The container is started detached with the same mounts and environment as docker_runner,
+    idling on `sleep infinity`; commands are then run in it with docker_exec_runner, so the
+    container start-up is paid once instead of per command. It is killed (and removed, via
+    --rm) when the block exits. Unused docker_runner settings are accepted and ignored.
+    """
+    container = f"dbt-ci-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    docker_cmd = _build_docker_run_command(
+        profiles_dir=profiles_dir,
+        docker_image=docker_image,
+        docker_platform=docker_platform,
+        docker_volumes=docker_volumes,
+        docker_env=docker_env,
+        docker_args=docker_args,
+        entrypoint="sleep"
+    )
+    docker_cmd[2:2] = ["-d", "--rm", "--name", container]
+    docker_cmd.append("infinity")
+
+    run_checked(docker_cmd, quiet=True)
     try:
-        result = subprocess.run(
-            docker_cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        
-        if not quiet:
-            print(result.stdout)
-        
-        return result
-    except subprocess.CalledProcessError as e:
-        if e.stderr:
-            print(e.stderr)
-        if e.stdout:
-            print(e.stdout)
-        raise
\ No newline at end of file
+        yield container
+    finally:
+        subprocess.run(["docker", "kill", container], capture_output=True)
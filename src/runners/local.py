@@ -1,35 +1,15 @@
-import subprocess
 from subprocess import CompletedProcess
+from src.runners.process import run_process
 from typing import List
 
 def local_runner(
     commands: List[str], 
     dry_run: bool = False,
-    quiet: bool = False
+    quiet: bool = False,
+    capture_stdout: bool = True
 ) -> CompletedProcess | None:
-    """Execute dbt commands locally."""
-    if not quiet:
-        print(f"Running command: {' '.join(commands)}")
-    
-    if dry_run:
-        print("DRY RUN: Command would be executed")
-        return None
-    
-    try:
-        result = subprocess.run(
-            commands,
-            check=True,
-            capture_output=True,
-            text=True
-        )
+    """Execute dbt commands locally.
 
-        if not quiet:
-            print(result.stdout)
-
-        return result
-    except subprocess.CalledProcessError as e:
-        if e.stderr:
-            print(e.stderr)
-        if e.stdout:
-            print(e.stdout)
-        raise
\ No newline at end of file
+    With quiet and capture_stdout=False the output is discarded instead of collected.
+    """
+    return run_process(commands, dry_run=dry_run, quiet=quiet, capture_stdout=capture_stdout)
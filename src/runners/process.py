@@ -0,0 +1,118 @@
+"""Subprocess execution shared by the runners that spawn dbt as a separate process."""
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+from functools import lru_cache
+from subprocess import CompletedProcess
+from typing import List
+
+@lru_cache(maxsize=32)
+def _resolve_executable(program: str) -> str:
+    """Resolve a bare program name on PATH; paths and unknown names are returned unchanged."""
+    return shutil.which(program) or program
+
+def _decode(data: bytes | None) -> str | None:
+    return data.decode("utf-8", errors="replace") if data is not None else None
+
+def run_streaming(args: List[str], quiet: bool = False, capture_stdout: bool = True) -> CompletedProcess:
+    """
+    Run a command, echoing its stdout line by line as it is produced unless quiet is set.
+
+    stdout is read on the calling thread and stderr on a helper thread, so neither pipe can fill
+    up and block the child. Both are still collected and returned, like subprocess.run with
+    capture_output=True and text=True.
+
+    When quiet, nothing is echoed, so the output is read as raw bytes and decoded once at the
+    end instead of line by line; with capture_stdout=False as well, stdout is sent to
+    /dev/null and never read at all (the result's stdout is then None). stderr is always kept
+    for error reporting.
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status.
+    """
+    # CPython only launches through posix_spawn (instead of forking this interpreter, dbt
+    # imports and all) when the executable has a directory part and close_fds is off. Python
+    # opens its own descriptors non-inheritable, so nothing extra leaks into the child.
+    popen_kwargs = {
+        "executable": _resolve_executable(args[0]),
+        "close_fds": False,
+        "stderr": subprocess.PIPE,
+        "bufsize": -1,
+    }
+
+    if quiet:
+        with subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            **popen_kwargs
+        ) as process:
+            stdout_bytes, stderr_bytes = process.communicate()
+            returncode = process.returncode
+        stdout = _decode(stdout_bytes)
+        stderr = _decode(stderr_bytes)
+    else:
+        stderr_lines: List[str] = []
+        with subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            text=True,
+            **popen_kwargs
+        ) as process:
+            stderr_reader = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+            stderr_reader.start()
+
+            stdout_lines: List[str] = []
+            for line in process.stdout:
+                stdout_lines.append(line)
+                sys.stdout.write(line)
+
+            stderr_reader.join()
+            returncode = process.wait()
+        stdout = "".join(stdout_lines)
+        stderr = "".join(stderr_lines)
+
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, output=stdout, stderr=stderr)
+    return CompletedProcess(args=args, returncode=returncode, stdout=stdout, stderr=stderr)
+
+def run_checked(args: List[str], quiet: bool = False, capture_stdout: bool = True) -> CompletedProcess:
+    """
+    run_streaming, printing the command's stderr (and its stdout, if it was not echoed) when it fails.
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status.
+    """
+    try:
+        return run_streaming(args, quiet=quiet, capture_stdout=capture_stdout)
+    except subprocess.CalledProcessError as e:
+        if e.stderr:
+            print(e.stderr)
+        # stdout was already echoed while streaming unless quiet
+        if quiet and e.stdout:
+            print(e.stdout)
+        raise
+
+def run_process(
+    commands: List[str],
+    dry_run: bool = False,
+    quiet: bool = False,
+    capture_stdout: bool = True
+) -> CompletedProcess | None:
+    """
+    Log and run a command line, or only log it when dry_run is set.
+
+    Shared by the runners that execute dbt as a separate process.
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status.
+    """
+    if not quiet:
+        print(f"Running command: {shlex.join(commands)}")
+
+    if dry_run:
+        print("DRY RUN: Command would be executed")
+        return None
+
+    return run_checked(commands, quiet=quiet, capture_stdout=capture_stdout)
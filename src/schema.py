@@ -1,5 +1,5 @@
 """TypedDict definitions for dbt manifest.json structure and CLI arguments."""
-from typing import Dict, Any, List, Optional, TypedDict, NotRequired, Literal, Set
+from typing import AbstractSet, Dict, Any, List, Optional, Sequence, TypedDict, NotRequired, Literal
 
 class DBTProfile(TypedDict):
     """Structure of a dbt profiles.yml profile."""
@@ -286,15 +286,17 @@ type DependencyGraphNodeType = Literal[
     "exposure"
 ]
 class DependenciesByType(TypedDict):
-    model: Set[str]
-    macro: Set[str]
-    source: Set[str]
-    seed: Set[str]
-    snapshot: Set[str]
-    test: Set[str]
-    exposure: Set[str]
+    # Types without members share one empty frozenset instead of holding their own set
+    model: AbstractSet[str]
+    macro: AbstractSet[str]
+    source: AbstractSet[str]
+    seed: AbstractSet[str]
+    snapshot: AbstractSet[str]
+    test: AbstractSet[str]
+    exposure: AbstractSet[str]
 class DependencyGraphDownstreamDependency(TypedDict):
-    node_dependencies: Set[str]
+    # Sets while the graph is built, frozensets once generate_dependency_graph returns
+    node_dependencies: AbstractSet[str]
     dependencies_by_type: DependenciesByType
 
 class DependencyGraphNode(TypedDict):
@@ -306,8 +308,8 @@ class DependencyGraphNode(TypedDict):
     resource_type: DependencyGraphNodeType
     original_file_path: str
     compiled_path: str
-    compiled_code: str
-    columns: Set[str]
+    compiled_code: Optional[str]  # None unless built with include_compiled_code
+    columns: List[str]
     downstream_dependencies: DependencyGraphDownstreamDependency
     upstream_dependencies: DependencyGraphDownstreamDependency
     indirect_upstream_dependencies: DependencyGraphDownstreamDependency
@@ -325,6 +327,23 @@ class DependencyGraph(TypedDict):
     exposure: Dict[str, DependencyGraphNode]
 
 
+class DownstreamAdjacency(TypedDict):
+    """Compressed sparse row (CSR) view of downstream edges, indexed by integer node position.
+
+    The children of node_ids[i] are node_ids[j] for j in indices[indptr[i]:indptr[i + 1]].
+    """
+    node_ids: List[str]
+    id_to_idx: Dict[str, int]
+    indptr: Any  # array('I')
+    indices: Any  # array('I')
+
+
+class SlackReport(TypedDict):
+    """A Slack message: plain-text fallback plus its Block Kit blocks."""
+    message: str
+    blocks: Sequence[Dict[str, Any]]
+
+
 class RunnerConfig(TypedDict):
     """Configuration for dbt command execution across different runners."""
     runner: Literal["local", "docker", "bash", "dbt"]
@@ -336,6 +355,9 @@ class RunnerConfig(TypedDict):
     entrypoint: str
     dry_run: bool
     quiet: bool
+    reuse_runner: NotRequired[bool]  # dbt Python API: share one dbtRunner across calls (default True)
+    reuse_manifest: NotRequired[bool]  # dbt Python API: reuse the parsed Manifest while the project is unchanged (default False)
+    local_in_process: NotRequired[bool]  # local runner: use the dbt Python API when `dbt` on PATH is this interpreter's (default False)
     
     # Docker-specific configuration
     docker_image: Optional[str]
@@ -345,6 +367,7 @@ class RunnerConfig(TypedDict):
     docker_network: str
     docker_user: Optional[str]
     docker_args: str
+    docker_container: NotRequired[str]  # Set by docker_session: run commands in this container via docker exec
     
     # Bash-specific configuration
     shell_path: str
\ No newline at end of file
@@ -1,7 +1,14 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Any, List
+from typing import BinaryIO, Callable, Any, List, Optional
+import json
+import mmap
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def run_multithreaded(
     func_list: List[Callable[[], Any]],
     threads: int = 4,
@@ -38,3 +45,59 @@ def run_multithreaded(
                     results[idx] = e
 
     return results
+
+
+def json_loads(data: bytes | str) -> Any:
+    """
+    Deserialize JSON, using orjson when it is installed and the stdlib json module otherwise.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_load_file(file: BinaryIO) -> Any:
+    """
+    Deserialize JSON from a file opened in binary mode.
+
+    With orjson the file is memory-mapped and decoded in place, so the raw bytes are never
+    copied into a separate bytes object; this roughly halves peak memory on large manifests.
+    """
+    if orjson is not None:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and non-regular files (pipes) cannot be mapped
+            mapped = None
+        if mapped is not None:
+            with mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+    return json_loads(file.read())
+
+
+def set_default(obj: Any) -> List[Any]:
+    """
+    JSON default hook that writes sets and frozensets as sorted arrays, giving stable diffs.
+
+    Raises:
+        TypeError: If obj is any other non-serializable type.
+    """
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, indent: bool = True) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes, using orjson when it is installed.
+
+    Args:
+        obj: The object to serialize.
+        default: Called for objects that are not natively serializable (e.g. sets).
+        indent: If True, indent with 2 spaces; otherwise emit compact JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, default=default, indent=2).encode("utf-8")
+    return json.dumps(obj, default=default, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,51 @@
+"""Tests for command-line parsing and runner sniffing."""
+import pytest
+
+from src.cli.args import parse_args, sniff_option
+
+REQUIRED = ["--state", "state", "--dbt-project-dir", "."]
+
+
+@pytest.mark.parametrize("argv", [
+    ["--runner", "docker"],
+    ["--runner=docker"],
+    ["-r", "docker"],
+    ["-rdocker"],
+    ["--run", "docker"],
+])
+def test_sniff_option_accepts_every_argparse_spelling(argv):
+    assert sniff_option([*REQUIRED, *argv], ("--runner", "-r")) == "docker"
+
+
+@pytest.mark.parametrize("argv", [REQUIRED, [*REQUIRED, "-r"]])
+def test_sniff_option_without_a_value(argv):
+    assert sniff_option(argv, ("--runner", "-r")) is None
+
+
+def test_runner_specific_options_are_parsed_for_the_sniffed_runner():
+    args = parse_args([*REQUIRED, "-rdocker", "--docker-image", "img"])
+
+    assert args.runner == "docker"
+    assert args.docker_image == "img"
+
+
+def test_other_runners_options_are_accepted_through_the_reparse():
+    args = parse_args([*REQUIRED, "--runner", "dbt", "--docker-image", "img", "--shell-path", "/bin/sh"])
+
+    assert args.runner == "dbt"
+    assert args.docker_image == "img"
+    assert args.shell_path == "/bin/sh"
+
+
+def test_options_of_the_selected_runner_only_are_parsed_without_the_reparse():
+    args = parse_args([*REQUIRED, "--runner", "dbt"])
+
+    assert not hasattr(args, "docker_image")
+
+
+def test_unknown_options_are_still_rejected(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        parse_args([*REQUIRED, "--bogus"])
+
+    assert excinfo.value.code == 2
+    assert "unrecognized arguments: --bogus" in capsys.readouterr().err
@@ -0,0 +1,157 @@
+"""Tests for manifest-diff based modified node detection in DbtGraph."""
+import json
+import os
+from argparse import Namespace
+
+import pytest
+
+from src.dependency_graph import DbtGraph
+
+
+def _manifest() -> dict:
+    """A source and a model that share the name "customers", plus a model built on top."""
+    return {
+        "metadata": {},
+        "nodes": {
+            "model.p.customers": {
+                "name": "customers",
+                "resource_type": "model",
+                "raw_code": "select * from {{ source('raw', 'customers') }}",
+                "columns": {},
+                "depends_on": {"nodes": ["source.p.raw.customers"], "macros": []},
+            },
+            "model.p.orders": {
+                "name": "orders",
+                "resource_type": "model",
+                "raw_code": "select * from {{ ref('customers') }}",
+                "columns": {},
+                "depends_on": {"nodes": ["model.p.customers"], "macros": ["macro.p.cents"]},
+            },
+        },
+        "sources": {
+            "source.p.raw.customers": {
+                "name": "customers",
+                "resource_type": "source",
+                "columns": {"id": {}},
+            },
+        },
+        "macros": {
+            "macro.p.cents": {
+                "name": "cents",
+                "resource_type": "macro",
+                "macro_sql": "{{ round_to(2) }}",
+                "depends_on": {"macros": ["macro.p.round_to"]},
+            },
+            "macro.p.round_to": {
+                "name": "round_to",
+                "resource_type": "macro",
+                "macro_sql": "round(x, 2)",
+                "depends_on": {"macros": []},
+            },
+        },
+        "exposures": {},
+        "child_map": {
+            "source.p.raw.customers": ["model.p.customers"],
+            "model.p.customers": ["model.p.orders"],
+            "model.p.orders": [],
+        },
+    }
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    # Keep the dependency graph cache inside the test directory
+    monkeypatch.setenv("DBT_CI_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "dbt_project.yml").write_text("name: p\nprofile: p\n")
+    (tmp_path / "profiles.yml").write_text("p:\n  target: dev\n  outputs:\n    dev: {}\n")
+    (tmp_path / "target").mkdir()
+    (tmp_path / "state").mkdir()
+
+    def write(target_manifest: dict, reference_manifest: dict) -> None:
+        (tmp_path / "target" / "manifest.json").write_text(json.dumps(target_manifest))
+        (tmp_path / "state" / "manifest.json").write_text(json.dumps(reference_manifest))
+
+    return tmp_path, write
+
+
+def _graph(project_dir, user_production_state: bool = False) -> DbtGraph:
+    args = Namespace(
+        runner="local",
+        selector="",
+        mode="run",
+        dbt_project_dir=str(project_dir),
+        prod_manifest_dir=str(project_dir / "state"),
+        profiles_dir=None,
+        target=None,
+        vars="",
+        dry_run=True,
+        log_level="INFO",
+        entrypoint="dbt",
+    )
+    return DbtGraph(args, user_production_state=user_production_state)
+
+
+def test_unchanged_manifests_have_no_modified_nodes(project):
+    project_dir, write = project
+    write(_manifest(), _manifest())
+
+    assert _graph(project_dir).get_modified_nodes() is None
+
+
+@pytest.mark.parametrize("user_production_state", [False, True])
+def test_changed_source_sharing_a_model_name_is_detected(project, user_production_state):
+    project_dir, write = project
+    target = _manifest()
+    target["sources"]["source.p.raw.customers"]["columns"] = {"id": {}, "email": {}}
+    write(target, _manifest())
+
+    assert _graph(project_dir, user_production_state).get_modified_nodes() == ["customers", "orders"]
+
+
+@pytest.mark.parametrize("user_production_state", [False, True])
+def test_changed_model_is_detected(project, user_production_state):
+    project_dir, write = project
+    target = _manifest()
+    target["nodes"]["model.p.orders"]["raw_code"] = "select 1"
+    write(target, _manifest())
+
+    assert _graph(project_dir, user_production_state).get_modified_nodes() == ["orders"]
+
+
+def test_macro_change_reaches_nodes_through_calling_macros(project):
+    project_dir, write = project
+    target = _manifest()
+    target["macros"]["macro.p.round_to"]["macro_sql"] = "round(x, 4)"
+    write(target, _manifest())
+
+    assert _graph(project_dir).get_modified_nodes() == ["orders"]
+
+
+def test_to_json_leaves_unchanged_output_untouched(project, tmp_path):
+    project_dir, write = project
+    write(_manifest(), _manifest())
+    graph = _graph(project_dir)
+    destination = tmp_path / "dependency_graph.json"
+    graph.to_json(str(destination))
+    os.utime(destination, ns=(0, 0))
+
+    graph.to_json(str(destination))
+
+    assert destination.stat().st_mtime_ns == 0
+
+
+def test_to_json_replaces_changed_output_atomically(project, tmp_path, monkeypatch):
+    project_dir, write = project
+    write(_manifest(), _manifest())
+    graph = _graph(project_dir)
+    destination = tmp_path / "dependency_graph.json"
+    destination.write_text("{}")
+    replaced = []
+    replace = os.replace
+    monkeypatch.setattr(os, "replace", lambda src, dst: (replaced.append((src, dst)), replace(src, dst)))
+
+    graph.to_json(str(destination))
+
+    assert replaced == [(f"{destination}.tmp", str(destination))]
+    assert json.loads(destination.read_text())["model"]["orders"]["id"] == "model.p.orders"
+    assert sorted(path.name for path in tmp_path.glob("dependency_graph.json*")) == ["dependency_graph.json"]
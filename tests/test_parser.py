@@ -0,0 +1,165 @@
+"""Tests for building the dependency graph from a manifest."""
+import json
+import os
+from typing import Dict, Set
+
+import pytest
+
+from src.parser import EMPTY_DEPENDENCIES, generate_cached_dependency_graph, generate_dependency_graph
+
+
+def _item(name: str, resource_type: str, nodes=(), macros=()) -> dict:
+    return {
+        "name": name,
+        "resource_type": resource_type,
+        "raw_code": f"select '{name}'",
+        "columns": {},
+        "depends_on": {"nodes": list(nodes), "macros": list(macros)},
+    }
+
+
+@pytest.fixture
+def manifest_dir(tmp_path):
+    """A small project: source -> stg -> mart -> analysis/test, with macros outside child_map."""
+    nodes = {
+        "model.p.stg": _item("stg", "model", nodes=["source.p.raw.t"], macros=["macro.p.clean"]),
+        "model.p.mart": _item("mart", "model", nodes=["model.p.stg"], macros=["macro.p.money"]),
+        "model.p.report": _item("report", "model", nodes=["model.p.mart"]),
+        "test.p.not_null": _item("not_null", "test", nodes=["model.p.mart"]),
+    }
+    sources = {"source.p.raw.t": {"name": "t", "resource_type": "source", "columns": {}}}
+    macros = {
+        "macro.p.clean": {"name": "clean", "macro_sql": "{{ x }}", "depends_on": {"macros": []}},
+        "macro.p.money": {"name": "money", "macro_sql": "{{ y }}", "depends_on": {"macros": []}},
+    }
+    # dbt leaves macros out of child_map; the analysis is not a tracked node type
+    child_map = {
+        "source.p.raw.t": ["model.p.stg"],
+        "model.p.stg": ["model.p.mart"],
+        "model.p.mart": ["model.p.report", "test.p.not_null"],
+        "model.p.report": ["analysis.p.adhoc"],
+        "test.p.not_null": [],
+        "analysis.p.adhoc": [],
+    }
+    manifest = {
+        "metadata": {},
+        "nodes": nodes,
+        "sources": sources,
+        "macros": macros,
+        "exposures": {},
+        "child_map": child_map,
+    }
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "manifest.json").write_text(json.dumps(manifest))
+    return str(tmp_path)
+
+
+def _reference_indirect(id_to_node: Dict[str, dict], direction: str) -> Dict[str, Set[str]]:
+    """Straightforward string-based walk: everything reachable from the direct dependencies.
+
+    Nodes outside the graph are kept as leaves, as the graph has always done.
+    """
+    key = f"{direction}_dependencies"
+
+    def reachable(node_id: str) -> Set[str]:
+        seen: Set[str] = set()
+        stack = [node_id]
+        while stack:
+            node = id_to_node.get(stack.pop())
+            if node is None:
+                continue
+            for dep_id in node[key]["node_dependencies"]:
+                if dep_id not in seen:
+                    seen.add(dep_id)
+                    stack.append(dep_id)
+        return seen
+
+    result = {}
+    for node_id, node in id_to_node.items():
+        indirect: Set[str] = set()
+        for dep_id in node[key]["node_dependencies"]:
+            if dep_id in id_to_node:
+                indirect |= reachable(dep_id)
+        result[node_id] = indirect
+    return result
+
+
+def test_indirect_dependencies_match_reference_walk(manifest_dir):
+    graph = generate_dependency_graph(manifest_dir)
+    id_to_node = {
+        node["id"]: node
+        for node_type, nodes in graph.items() if node_type != "metadata"
+        for node in nodes.values()
+    }
+
+    for direction in ("upstream", "downstream"):
+        expected = _reference_indirect(id_to_node, direction)
+        for node_id, node in id_to_node.items():
+            assert set(node[f"indirect_{direction}_dependencies"]["node_dependencies"]) == expected[node_id], (
+                direction, node_id
+            )
+
+
+def test_indirect_dependencies_keep_ids_outside_the_graph(manifest_dir):
+    graph = generate_dependency_graph(manifest_dir)
+
+    report_upstream = graph["model"]["report"]["indirect_upstream_dependencies"]
+    assert {"macro.p.clean", "macro.p.money", "model.p.stg", "source.p.raw.t"} <= report_upstream["node_dependencies"]
+    # Ids outside the graph have no node to name, so they are not listed by type
+    assert report_upstream["dependencies_by_type"]["macro"] == frozenset()
+    assert report_upstream["dependencies_by_type"]["model"] == {"stg"}
+
+    stg_downstream = graph["model"]["stg"]["indirect_downstream_dependencies"]
+    assert stg_downstream["node_dependencies"] == {"model.p.report", "test.p.not_null", "analysis.p.adhoc"}
+
+
+def test_cached_dependency_graph_round_trips(manifest_dir, tmp_path_factory, monkeypatch):
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("DBT_CI_CACHE_DIR", str(cache_dir))
+    graph = generate_dependency_graph(manifest_dir)
+
+    assert generate_cached_dependency_graph(manifest_dir) == graph
+    cached = generate_cached_dependency_graph(manifest_dir)
+
+    assert cached == graph
+    # The cache lives in the tool's own directory as JSON, never next to the manifest
+    assert [path.suffix for path in cache_dir.iterdir()] == [".json"]
+    assert os.listdir(os.path.join(manifest_dir, "target")) == ["manifest.json"]
+    dependencies = cached["model"]["stg"]["downstream_dependencies"]
+    assert isinstance(dependencies["node_dependencies"], frozenset)
+    assert dependencies["dependencies_by_type"]["exposure"] is EMPTY_DEPENDENCIES
+
+
+def test_corrupt_dependency_graph_cache_is_rebuilt(manifest_dir, tmp_path_factory, monkeypatch):
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("DBT_CI_CACHE_DIR", str(cache_dir))
+    graph = generate_cached_dependency_graph(manifest_dir)
+    for path in cache_dir.iterdir():
+        # Keep the valid key line so the truncated graph is actually read
+        key_line = path.read_bytes().partition(b"\n")[0]
+        path.write_bytes(key_line + b'\n{"model": ')
+
+    assert generate_cached_dependency_graph(manifest_dir) == graph
+
+
+def test_dependency_graph_is_built_without_a_usable_cache_dir(manifest_dir, tmp_path_factory, monkeypatch):
+    graph = generate_dependency_graph(manifest_dir)
+    # A regular file where the cache directory should be, so it cannot be created
+    blocked = tmp_path_factory.mktemp("cache") / "file"
+    blocked.write_text("")
+    monkeypatch.setenv("DBT_CI_CACHE_DIR", str(blocked / "dbt-ci"))
+
+    assert generate_cached_dependency_graph(manifest_dir) == graph
+
+
+def test_dependency_graph_cache_can_be_turned_off(manifest_dir, tmp_path_factory, monkeypatch):
+    cache_home = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    graph = generate_dependency_graph(manifest_dir)
+
+    monkeypatch.setenv("DBT_CI_CACHE_DIR", "")
+    assert generate_cached_dependency_graph(manifest_dir) == graph
+    monkeypatch.delenv("DBT_CI_CACHE_DIR")
+    assert generate_cached_dependency_graph(manifest_dir, use_cache=False) == graph
+
+    assert list(cache_home.iterdir()) == []
@@ -0,0 +1,50 @@
+"""Tests for manifest loading and memoization."""
+import json
+import threading
+import time
+
+import pytest
+
+import src.paths as paths
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "manifest.json").write_text(json.dumps({
+        "metadata": {},
+        "nodes": {"model.p.a": {"name": "a"}},
+        "sources": {},
+        "docs": {"doc.p.x": {}},
+    }))
+    paths._load_manifest_memoized.cache_clear()
+    yield str(tmp_path)
+    paths._load_manifest_memoized.cache_clear()
+
+
+def test_concurrent_full_and_sectioned_loads_decode_once(project_dir, monkeypatch):
+    load_manifest = paths._load_manifest
+    calls = []
+
+    def slow_load_manifest(file):
+        calls.append(file)
+        time.sleep(0.05)
+        return load_manifest(file)
+
+    monkeypatch.setattr(paths, "_load_manifest", slow_load_manifest)
+    results = {}
+    threads = [
+        threading.Thread(target=lambda: results.update(full=paths.get_manifest_file(project_dir))),
+        threading.Thread(target=lambda: results.update(
+            sectioned=paths.get_manifest_file(project_dir, sections=("nodes", "child_map"))
+        )),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    # The sections view shares the section objects of the full decode
+    assert results["sectioned"] == {"nodes": results["full"]["nodes"]}
+    assert results["sectioned"]["nodes"] is results["full"]["nodes"]
@@ -0,0 +1,148 @@
+"""Tests for the dbt command dispatcher and its runners."""
+from subprocess import CompletedProcess
+
+import pytest
+
+import src.runners as runners
+
+
+@pytest.fixture
+def runner_config(tmp_path):
+    return {
+        "runner": "local",
+        "dbt_project_dir": str(tmp_path),
+        "prod_manifest_dir": str(tmp_path / "state"),
+        "profiles_dir": None,
+        "target": None,
+        "vars": "",
+        "entrypoint": "dbt",
+        "dry_run": False,
+        "quiet": True,
+    }
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(runners, "local_runner", lambda commands, **kwargs: calls.append(("local", kwargs)))
+    monkeypatch.setattr(runners, "dbt_runner", lambda commands, **kwargs: calls.append(("dbt", kwargs)))
+    monkeypatch.setattr(runners, "_dbt_on_path_is_importable", lambda: True)
+    return calls
+
+
+def test_local_runner_spawns_dbt_by_default(runner_config, calls):
+    runners.run_dbt_command(["ls"], runner_config, capture_stdout=False)
+
+    assert calls == [("local", {"dry_run": False, "quiet": True, "capture_stdout": False})]
+
+
+def test_local_runner_goes_in_process_only_when_enabled(runner_config, calls):
+    runners.run_dbt_command(["ls"], dict(runner_config, local_in_process=True), capture_stdout=False)
+
+    [(runner, kwargs)] = calls
+    assert runner == "dbt"
+    assert kwargs["check"] is True
+    assert kwargs["capture_stdout"] is False
+
+
+def test_local_runner_spawns_dbt_when_path_dbt_is_another_install(runner_config, calls, monkeypatch):
+    monkeypatch.setattr(runners, "_dbt_on_path_is_importable", lambda: False)
+
+    runners.run_dbt_command(["ls"], dict(runner_config, local_in_process=True))
+
+    assert [runner for runner, _ in calls] == ["local"]
+
+
+@pytest.fixture
+def docker_commands(monkeypatch):
+    """Record every docker command line instead of running it; each `docker exec` returns its own result."""
+    import src.runners.docker as docker
+
+    commands = []
+
+    def run_checked(command, quiet, capture_stdout=True):
+        commands.append(command)
+        return CompletedProcess(command, 0, stdout=f"output {len(commands)}", stderr="")
+
+    monkeypatch.setattr(docker, "run_checked", run_checked)
+    monkeypatch.setattr(docker.subprocess, "run", lambda command, **kwargs: commands.append(command))
+    return commands
+
+
+def test_docker_batch_runs_each_command_in_one_session_container(runner_config, docker_commands):
+    config = dict(runner_config, runner="docker", docker_image="img", docker_user="1000:1000")
+
+    results = runners.run_dbt_commands_batch([["deps"], ["ls", "--select", "a"]], config)
+
+    start, *execs, kill = docker_commands
+    container = start[start.index("--name") + 1]
+    assert execs == [
+        ["docker", "exec", container, "dbt", "deps"],
+        ["docker", "exec", container, "dbt", "ls", "--select", "a"],
+    ]
+    assert kill == ["docker", "kill", container]
+    assert [result.stdout for result in results] == ["output 2", "output 3"]
+
+
+def test_relative_paths_follow_the_working_directory(tmp_path, monkeypatch):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    monkeypatch.chdir(tmp_path / "a")
+    first = runners._absolutize_path_args(["ls", "--project-dir", "project"])
+    monkeypatch.chdir(tmp_path / "b")
+    second = runners._absolutize_path_args(["ls", "--project-dir", "project"])
+
+    assert first[-1] == str(tmp_path / "a" / "project")
+    assert second[-1] == str(tmp_path / "b" / "project")
+
+
+def test_docker_session_starts_execs_and_kills_one_container(runner_config, docker_commands, tmp_path):
+    config = dict(
+        runner_config,
+        runner="docker",
+        profiles_dir=str(tmp_path / "profiles"),
+        docker_image="img",
+        docker_platform="linux/amd64",
+        docker_volumes=["/data:/data"],
+        docker_env=["A=1"],
+        docker_user="1000:1000",
+    )
+
+    with runners.docker_session(config) as session_config:
+        container = session_config["docker_container"]
+        runners.run_dbt_command(["ls", "--project-dir", str(tmp_path)], session_config)
+
+    assert container.startswith("dbt-ci-")
+    assert docker_commands == [
+        [
+            "docker", "run", "-d", "--rm", "--name", container,
+            "--platform", "linux/amd64",
+            "-v", f"{tmp_path / 'profiles'}:/root/.dbt", "-e", "DBT_PROFILES_DIR=/root/.dbt",
+            "-v", "/data:/data", "-e", "A=1",
+            "--entrypoint", "sleep", "img", "infinity",
+        ],
+        ["docker", "exec", container, "dbt", "ls", "--project-dir", "/usr/app"],
+        ["docker", "kill", container],
+    ]
+    assert "docker_container" not in config
+
+
+def test_docker_session_kills_the_container_when_the_block_fails(runner_config, docker_commands):
+    config = dict(runner_config, runner="docker", docker_image="img", docker_user="1000:1000")
+
+    with pytest.raises(RuntimeError):
+        with runners.docker_session(config) as session_config:
+            raise RuntimeError("boom")
+
+    assert docker_commands[-1] == ["docker", "kill", session_config["docker_container"]]
+
+
+@pytest.mark.parametrize("overrides", [{"runner": "local"}, {"runner": "docker", "dry_run": True}])
+def test_docker_session_is_a_no_op_for_other_runners_and_dry_runs(runner_config, docker_commands, overrides):
+    config = dict(runner_config, docker_image="img", **overrides)
+
+    with runners.docker_session(config) as session_config:
+        assert session_config is config
+
+    assert docker_commands == []